@@ -15,9 +15,9 @@ from .models import User, APIKey, AuditLog, UserSession
 from .forms import CustomUserCreationForm, CustomUserChangeForm, APIKeyForm
 from .decorators import role_required, audit_action
 from .signals import generate_api_key, get_client_ip
-from dashboard.docker_utils import DockerSwarmManager
+from dashboard.docker_utils import get_docker_manager
+from dashboard.json_utils import loads
 from django.db import models
-import json
 
 
 class LoginView(TemplateView):
@@ -326,7 +326,7 @@ def settings_view(request):
     recent_logs = AuditLog.objects.order_by('-timestamp')[:20]
 
     # Get system info
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
 
     try:
         docker_version = docker_manager.get_system_info().get('server_version', 'Unknown')
@@ -361,7 +361,7 @@ def toggle_user_status(request, user_id):
     """Toggle user active status"""
     try:
         user = get_object_or_404(User, id=user_id)
-        data = json.loads(request.body)
+        data = loads(request.body)
         activate = data.get('activate', False)
 
         if user == request.user:
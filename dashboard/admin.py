@@ -1,7 +1,8 @@
 from django.contrib import admin
+from django.db.models import Count
 from .models import (
     ServiceLog, ServiceGroup, ServiceGroupMapping,
-    ComposeStack, DeploymentHistory, Metric, Dashboard, DashboardPanel
+    ComposeStack, ComposeImportDraft, DeploymentHistory, Metric, MetricHourlyRollup, Dashboard, DashboardPanel
 )
 
 
@@ -24,6 +25,9 @@ class ServiceGroupAdmin(admin.ModelAdmin):
     list_filter = ['created_by', 'created_at']
     search_fields = ['name', 'description']
     readonly_fields = ['created_at', 'updated_at']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(services_count=Count('service_group_mappings'))
     
     def services_count(self, obj):
         return obj.get_services_count()
@@ -46,9 +50,18 @@ class ComposeStackAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
 
 
+@admin.register(ComposeImportDraft)
+class ComposeImportDraftAdmin(admin.ModelAdmin):
+    list_display = ['user', 'status', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['user__username']
+    readonly_fields = ['created_at']
+
+
 @admin.register(DeploymentHistory)
 class DeploymentHistoryAdmin(admin.ModelAdmin):
     list_display = ['stack', 'status', 'deployed_by', 'deployed_at']
+    list_select_related = ['stack', 'deployed_by']
     list_filter = ['status', 'deployed_by', 'deployed_at']
     search_fields = ['stack__name', 'deployed_by__username']
     readonly_fields = ['deployed_at']
@@ -79,6 +92,15 @@ class MetricAdmin(admin.ModelAdmin):
         return qs.order_by('-timestamp')[:10000]
 
 
+@admin.register(MetricHourlyRollup)
+class MetricHourlyRollupAdmin(admin.ModelAdmin):
+    list_display = ['measurement', 'field', 'bucket', 'value_count', 'value_min', 'value_max', 'updated_at']
+    list_filter = ['measurement', 'bucket']
+    search_fields = ['measurement', 'field', 'tags']
+    date_hierarchy = 'bucket'
+    readonly_fields = ['updated_at']
+
+
 @admin.register(Dashboard)
 class DashboardAdmin(admin.ModelAdmin):
     list_display = ['name', 'created_by', 'is_template', 'is_public', 'panels_count', 'created_at', 'updated_at']
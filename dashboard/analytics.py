@@ -1,9 +1,11 @@
 """
 Advanced Analytics and Historical Data Processing for Docker Swarm metrics
 """
+import hashlib
 import json
 import logging
 import statistics
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from django.utils import timezone
@@ -11,7 +13,7 @@ from django.conf import settings
 from django.db.models import Q, Avg, Max, Min, Count
 from django.core.cache import cache
 from .models import Metric, ServiceLog
-from .metrics import MetricsCollector
+from .metrics import get_metrics_collector
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,7 @@ class AnalyticsEngine:
     """Advanced analytics engine for historical metrics analysis"""
     
     def __init__(self):
-        self.metrics_collector = MetricsCollector()
+        self.metrics_collector = get_metrics_collector()
     
     def get_resource_usage_trends(self, time_range: str = '7d', granularity: str = '1h') -> Dict:
         """Get historical resource usage trends with statistical analysis"""
@@ -28,8 +30,8 @@ class AnalyticsEngine:
         
         # Get CPU, Memory, Network, Disk metrics
         metrics_data = {
-            'cpu': self._get_aggregated_metrics('system_resources', {'resource': 'cpu'}, start_time, end_time, granularity),
-            'memory': self._get_aggregated_metrics('system_resources', {'resource': 'memory'}, start_time, end_time, granularity),
+            'cpu': self._get_trend_metrics('system_resources', {'resource': 'cpu'}, start_time, end_time, granularity),
+            'memory': self._get_trend_metrics('system_resources', {'resource': 'memory'}, start_time, end_time, granularity),
             'network': self._get_network_metrics(start_time, end_time, granularity),
             'disk': self._get_disk_metrics(start_time, end_time, granularity)
         }
@@ -198,11 +200,16 @@ class AnalyticsEngine:
         
         return start_time, end_time
     
+    def _tags_cache_key(self, tags_filter: Dict) -> str:
+        """Build a stable, order-independent cache key fragment for a tag filter"""
+        canonical = json.dumps(tags_filter or {}, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+    
     def _get_aggregated_metrics(self, measurement: str, tags_filter: Dict, 
                                start_time: datetime, end_time: datetime, 
                                granularity: str) -> List[Dict]:
         """Get metrics data aggregated by time intervals"""
-        cache_key = f"metrics_{measurement}_{hash(str(tags_filter))}_{start_time}_{end_time}_{granularity}"
+        cache_key = f"metrics_{measurement}_{self._tags_cache_key(tags_filter)}_{start_time}_{end_time}_{granularity}"
         cached_data = cache.get(cache_key)
         
         if cached_data:
@@ -224,37 +231,49 @@ class AnalyticsEngine:
         else:
             interval = timedelta(minutes=5)  # Default
         
-        # Aggregate data
-        aggregated = []
-        current_time = start_time
+        # Bucket every point in a single pass instead of rescanning per interval
+        interval_seconds = interval.total_seconds()
+        buckets = {}
         
-        while current_time < end_time:
-            next_time = current_time + interval
-            
-            # Get data points in this interval
-            interval_data = [
-                point for point in raw_data 
-                if current_time <= point['timestamp'] < next_time
-            ]
+        for point in raw_data:
+            timestamp = point['timestamp']
+            if not start_time <= timestamp < end_time:
+                continue
             
-            if interval_data:
-                # Calculate aggregated values
-                values = [point['value'] for point in interval_data]
-                aggregated.append({
-                    'timestamp': current_time.isoformat(),
-                    'value': statistics.mean(values) if values else 0,
-                    'min': min(values) if values else 0,
-                    'max': max(values) if values else 0,
-                    'count': len(values)
-                })
-            
-            current_time = next_time
+            index = int((timestamp - start_time).total_seconds() // interval_seconds)
+            bucket = buckets.get(index)
+            if bucket is None:
+                buckets[index] = [point['value']]
+            else:
+                bucket.append(point['value'])
+        
+        aggregated = []
+        for index in sorted(buckets):
+            values = buckets[index]
+            aggregated.append({
+                'timestamp': (start_time + interval * index).isoformat(),
+                'value': sum(values) / len(values),
+                'min': min(values),
+                'max': max(values),
+                'count': len(values)
+            })
         
         # Cache for 5 minutes
         cache.set(cache_key, aggregated, 300)
         
         return aggregated
     
+    def _get_trend_metrics(self, measurement: str, tags_filter: Dict,
+                           start_time: datetime, end_time: datetime,
+                           granularity: str) -> List[Dict]:
+        """Get trend data from the hourly rollup, falling back to raw metrics"""
+        if granularity == '1h':
+            rollup_data = self.metrics_collector.get_hourly_rollup(measurement, tags_filter, start_time, end_time)
+            if rollup_data:
+                return rollup_data
+
+        return self._get_aggregated_metrics(measurement, tags_filter, start_time, end_time, granularity)
+    
     def _get_network_metrics(self, start_time: datetime, end_time: datetime, granularity: str) -> List[Dict]:
         """Get network metrics (placeholder - extend based on actual network monitoring)"""
         # This would be implemented based on your network monitoring setup
@@ -268,17 +287,14 @@ class AnalyticsEngine:
     def _get_unique_services(self, start_time: datetime, end_time: datetime) -> List[str]:
         """Get unique service IDs from metrics data"""
         try:
-            metrics = Metric.objects.filter(
-                measurement='service_replicas',
-                timestamp__gte=start_time,
-                timestamp__lte=end_time
-            ).values('tags').distinct()
-            
-            services = set()
-            for metric in metrics:
-                service_id = metric['tags'].get('service_id')
-                if service_id:
-                    services.add(service_id)
+            services = Metric.distinct_entity_ids(
+                Metric.objects.filter(
+                    measurement='service_replicas',
+                    timestamp__gte=start_time,
+                    timestamp__lte=end_time
+                ),
+                'service_id'
+            )
             
             return list(services)
         except Exception as e:
@@ -288,17 +304,14 @@ class AnalyticsEngine:
     def _get_unique_nodes(self, start_time: datetime, end_time: datetime) -> List[str]:
         """Get unique node IDs from metrics data"""
         try:
-            metrics = Metric.objects.filter(
-                measurement='node_resources',
-                timestamp__gte=start_time,
-                timestamp__lte=end_time
-            ).values('tags').distinct()
-            
-            nodes = set()
-            for metric in metrics:
-                node_id = metric['tags'].get('node_id')
-                if node_id:
-                    nodes.add(node_id)
+            nodes = Metric.distinct_entity_ids(
+                Metric.objects.filter(
+                    measurement='node_resources',
+                    timestamp__gte=start_time,
+                    timestamp__lte=end_time
+                ),
+                'node_id'
+            )
             
             return list(nodes)
         except Exception as e:
@@ -528,4 +541,18 @@ class AnalyticsEngine:
         for row in data:
             csv_lines.append(','.join(str(row.get(header, '')) for header in headers))
         
-        return '\n'.join(csv_lines)
\ No newline at end of file
+        return '\n'.join(csv_lines)
+
+
+_analytics_engine = None
+_analytics_engine_lock = threading.Lock()
+
+
+def get_analytics_engine() -> AnalyticsEngine:
+    """Get the shared per-process analytics engine"""
+    global _analytics_engine
+    if _analytics_engine is None:
+        with _analytics_engine_lock:
+            if _analytics_engine is None:
+                _analytics_engine = AnalyticsEngine()
+    return _analytics_engine
@@ -0,0 +1,44 @@
+"""
+Helpers for caching expensive upstream calls in the Django cache
+"""
+
+import functools
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def cached_with_fallback(key: str, ttl: float, stale_ttl: float = 300):
+    """Cache a zero-argument call's result for ``ttl`` seconds
+
+    A second copy is kept for ``stale_ttl`` seconds and returned when the
+    wrapped call raises, so a brief upstream outage serves the last good
+    value instead of failing.
+    """
+    stale_key = f"{key}:stale"
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            value = cache.get(key)
+            if value is not None:
+                return value
+
+            try:
+                value = func(*args, **kwargs)
+            except Exception as e:
+                stale = cache.get(stale_key)
+                if stale is None:
+                    raise
+                logger.warning("Serving stale %s after upstream error: %s", key, e)
+                return stale
+
+            cache.set(key, value, ttl)
+            cache.set(stale_key, value, stale_ttl)
+            return value
+
+        return wrapper
+
+    return decorator
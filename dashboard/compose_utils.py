@@ -12,9 +12,111 @@ from urllib.parse import urlparse
 
 import yaml
 from django.conf import settings
+from yaml.constructor import SafeConstructor
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+try:
+    import ryml
+    RYML_AVAILABLE = True
+except ImportError:
+    RYML_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Unit letters accepted in compose memory limits
+_MEMORY_UNITS = frozenset("kmg")
+
+# Resolve plain scalars from rapidyaml exactly as the PyYAML safe loader would.
+# Scalars go straight to the per-tag constructor functions: construct_object()
+# would record every node in the shared constructor's state, which only a
+# full document load clears and which isn't safe to share between threads
+_scalar_resolver = Resolver()
+_scalar_constructor = SafeConstructor()
+_scalar_constructors = SafeConstructor.yaml_constructors
+
+
+class _UnsupportedYaml(Exception):
+    """Raised for YAML features the rapidyaml fast path leaves to PyYAML"""
+
+
+def _ryml_scalar(text, quoted: bool):
+    """Convert a rapidyaml scalar to the Python value PyYAML would produce"""
+    value = "" if text is None else bytes(text).decode("utf-8")
+    if quoted:
+        return value
+    tag = _scalar_resolver.resolve(ScalarNode, value, (True, False))
+    return _scalar_constructors[tag](_scalar_constructor, ScalarNode(tag, value))
+
+
+def _ryml_node(tree, node):
+    """Build plain dicts, lists and scalars from a rapidyaml tree node"""
+    if tree.is_ref(node) or tree.has_val_anchor(node) or tree.has_val_tag(node):
+        raise _UnsupportedYaml()
+
+    if tree.is_map(node):
+        result = {}
+        for child in ryml.children(tree, node):
+            if tree.is_key_ref(child) or tree.has_key_anchor(child) or tree.has_key_tag(child):
+                raise _UnsupportedYaml()
+            key = _ryml_scalar(tree.key(child), tree.is_key_quoted(child))
+            result[key] = _ryml_node(tree, child)
+        return result
+
+    if tree.is_seq(node):
+        return [_ryml_node(tree, child) for child in ryml.children(tree, node)]
+
+    return _ryml_scalar(tree.val(node), tree.is_val_quoted(node))
+
+
+def _load_yaml_ryml(text: str):
+    """Parse YAML with rapidyaml, covering the plain subset compose files use"""
+    tree = ryml.parse_in_arena(text.encode("utf-8"))
+    root = tree.root_id()
+    if tree.is_stream(root):
+        children = list(ryml.children(tree, root))
+        if len(children) != 1:
+            raise _UnsupportedYaml()
+        root = children[0]
+        if tree.is_doc(root) and not (tree.is_map(root) or tree.is_seq(root)):
+            raise _UnsupportedYaml()
+    return _ryml_node(tree, root)
+
+
+def load_yaml(stream):
+    """Parse YAML like yaml.safe_load, using libyaml's C loader when available"""
+    # rapidyaml is opt-in; anchors, tags and anything it can't map exactly
+    # fall back to PyYAML
+    if RYML_AVAILABLE and getattr(settings, "FAST_YAML", False):
+        text = stream.read() if hasattr(stream, "read") else stream
+        if isinstance(text, bytes):
+            text = text.decode("utf-8")
+        try:
+            return _load_yaml_ryml(text)
+        except Exception:
+            stream = text
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def dump_yaml(data, **kwargs) -> str:
+    """Serialize plain data like yaml.safe_dump, using libyaml's C emitter when available"""
+    return yaml.dump(data, Dumper=SafeDumper, **kwargs)
+
+
+def compose_metadata(compose_data: Dict) -> Tuple[int, List, List]:
+    """Return the services count and network and volume names of parsed compose data"""
+    # Top-level sections may be present but empty (``networks:``), i.e. None
+    return (
+        len(compose_data.get("services") or ()),
+        list(compose_data.get("networks") or ()),
+        list(compose_data.get("volumes") or ()),
+    )
+
 
 class ComposeImporter:
     """Import and convert Docker Compose files from Git repositories"""
@@ -142,7 +244,7 @@ class ComposeImporter:
         """Parse a Docker Compose file"""
         try:
             with open(file_path, "r", encoding="utf-8") as f:
-                content = yaml.safe_load(f)
+                content = load_yaml(f)
 
             if not isinstance(content, dict):
                 raise ValueError("Invalid compose file format")
@@ -363,16 +465,22 @@ class ComposeImporter:
 
         return all_services, metadata
 
-    def validate_service_for_swarm(self, service: Dict) -> List[str]:
-        """Validate a service configuration for Swarm deployment"""
-        warnings = []
+    def required_field_errors(self, service: Dict) -> List[str]:
+        """Problems that make a service impossible to create in Swarm"""
+        errors = []
 
-        # Check required fields
         if not service.get("name"):
-            warnings.append("Service name is required")
+            errors.append("Service name is required")
 
         if not service.get("image"):
-            warnings.append("Docker image is required")
+            errors.append("Docker image is required")
+
+        return errors
+
+    def validate_service_for_swarm(self, service: Dict) -> List[str]:
+        """Validate a service configuration for Swarm deployment"""
+        # Check required fields
+        warnings = self.required_field_errors(service)
 
         # Check for unsupported features
         if service.get("build_context"):
@@ -389,59 +497,68 @@ class ComposeImporter:
         resources = service.get("resources", {})
         if resources.get("memory_limit"):
             memory = resources["memory_limit"]
-            if isinstance(memory, str) and not any(
-                unit in memory.lower() for unit in ["k", "m", "g"]
-            ):
+            if isinstance(memory, str) and not _MEMORY_UNITS.intersection(memory.lower()):
                 warnings.append(
                     "Memory limit should include units (e.g., '512m', '1g')"
                 )
 
         return warnings
 
+    def validate_services(self, services: List[Dict]) -> Dict[str, List[str]]:
+        """Validate every service in one pass, keyed by service name"""
+        return {
+            service.get("name"): self.validate_service_for_swarm(service)
+            for service in services
+        }
+
+
+# Example repositories offered on the import page; static per deploy
+POPULAR_COMPOSE_REPOSITORIES = (
+    {
+        "name": "WordPress with MySQL",
+        "url": "https://github.com/docker/awesome-compose",
+        "path": "wordpress-mysql/compose.yaml",
+        "description": "WordPress with MySQL database",
+    },
+    {
+        "name": "NGINX + PHP + MySQL",
+        "url": "https://github.com/docker/awesome-compose",
+        "path": "nginx-php-mysql/compose.yaml",
+        "description": "LEMP stack with NGINX, PHP-FPM and MySQL",
+    },
+    {
+        "name": "Nextcloud with Redis",
+        "url": "https://github.com/docker/awesome-compose",
+        "path": "nextcloud-redis-mariadb/compose.yaml",
+        "description": "Nextcloud with Redis and MariaDB",
+    },
+    {
+        "name": "GitLab CE",
+        "url": "https://github.com/sameersbn/docker-gitlab",
+        "path": "docker-compose.yml",
+        "description": "GitLab Community Edition (comprehensive setup)",
+    },
+    {
+        "name": "Prometheus + Grafana",
+        "url": "https://github.com/docker/awesome-compose",
+        "path": "prometheus-grafana/compose.yaml",
+        "description": "Monitoring stack with Prometheus and Grafana",
+    },
+    {
+        "name": "PostgreSQL + Adminer",
+        "url": "https://github.com/docker/awesome-compose",
+        "path": "postgresql-pgadmin/compose.yaml",
+        "description": "PostgreSQL database with pgAdmin web interface",
+    },
+    {
+        "name": "Simple Web App",
+        "url": "https://github.com/docker/awesome-compose",
+        "path": "nginx-wsgi-flask/docker-compose.yml",
+        "description": "Simple Flask web application with NGINX",
+    },
+)
+
 
 def get_popular_compose_repositories():
     """Get a list of popular Docker Compose repositories for examples"""
-    return [
-        {
-            "name": "WordPress with MySQL",
-            "url": "https://github.com/docker/awesome-compose",
-            "path": "wordpress-mysql/compose.yaml",
-            "description": "WordPress with MySQL database",
-        },
-        {
-            "name": "NGINX + PHP + MySQL",
-            "url": "https://github.com/docker/awesome-compose",
-            "path": "nginx-php-mysql/compose.yaml",
-            "description": "LEMP stack with NGINX, PHP-FPM and MySQL",
-        },
-        {
-            "name": "Nextcloud with Redis",
-            "url": "https://github.com/docker/awesome-compose",
-            "path": "nextcloud-redis-mariadb/compose.yaml",
-            "description": "Nextcloud with Redis and MariaDB",
-        },
-        {
-            "name": "GitLab CE",
-            "url": "https://github.com/sameersbn/docker-gitlab",
-            "path": "docker-compose.yml",
-            "description": "GitLab Community Edition (comprehensive setup)",
-        },
-        {
-            "name": "Prometheus + Grafana",
-            "url": "https://github.com/docker/awesome-compose",
-            "path": "prometheus-grafana/compose.yaml",
-            "description": "Monitoring stack with Prometheus and Grafana",
-        },
-        {
-            "name": "PostgreSQL + Adminer",
-            "url": "https://github.com/docker/awesome-compose",
-            "path": "postgresql-pgadmin/compose.yaml",
-            "description": "PostgreSQL database with pgAdmin web interface",
-        },
-        {
-            "name": "Simple Web App",
-            "url": "https://github.com/docker/awesome-compose",
-            "path": "nginx-wsgi-flask/docker-compose.yml",
-            "description": "Simple Flask web application with NGINX",
-        },
-    ]
+    return POPULAR_COMPOSE_REPOSITORIES
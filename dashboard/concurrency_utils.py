@@ -0,0 +1,75 @@
+"""
+Helpers for running independent blocking calls concurrently
+"""
+
+import functools
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+# Threads for fire-and-forget work started by requests
+BACKGROUND_WORKERS = 4
+
+_background_executor = ThreadPoolExecutor(
+    max_workers=BACKGROUND_WORKERS, thread_name_prefix="background"
+)
+
+# Threads serving async_view views; sized for concurrent Docker socket waits
+# rather than the CPU-count default of asyncio's executor
+ASYNC_VIEW_WORKERS = int(os.getenv("ASGI_THREADS", "32"))
+
+_async_view_executor = ThreadPoolExecutor(
+    max_workers=ASYNC_VIEW_WORKERS, thread_name_prefix="async-view"
+)
+
+
+def _close_connection_after(func: Callable[[], Any]) -> Any:
+    """Run a callable in a worker thread and release its database connection"""
+    try:
+        return func()
+    finally:
+        connection.close()
+
+
+def run_in_parallel(*tasks: Callable[[], Any], max_workers: int = None) -> List[Any]:
+    """Run zero-argument callables concurrently and return results in order"""
+    if len(tasks) <= 1:
+        return [task() for task in tasks]
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks)) as executor:
+        futures = [executor.submit(_close_connection_after, task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+def map_in_parallel(func: Callable[[Any], Any], items: Iterable[Any], max_workers: int = 8) -> List[Any]:
+    """Apply a function to each item concurrently and return results in order"""
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(lambda item: _close_connection_after(lambda: func(item)), items))
+
+
+def submit_background(func: Callable, *args: Any) -> Future:
+    """Run a callable on the shared background pool without waiting for it"""
+    return _background_executor.submit(_close_connection_after, functools.partial(func, *args))
+
+
+def async_view(view: Callable) -> Callable:
+    """Serve a blocking view as an async view that runs on the async view pool"""
+    # Django's ASGI handler already gives each request its own thread for sync
+    # views, one new thread per request; views that only wait on the Docker
+    # socket run on this bounded, reused pool instead, which caps the threads
+    # those waits can hold. The pool threads don't manage DB connections, so
+    # the view must not touch the database or request.user.
+    run = sync_to_async(view, thread_sensitive=False, executor=_async_view_executor)
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await run(request, *args, **kwargs)
+
+    return wrapper
@@ -3,16 +3,22 @@ WebSocket consumers for real-time dashboard updates
 """
 
 import asyncio
-import json
 
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
-from .docker_utils import DockerSwarmManager
+from .docker_utils import get_docker_manager
+from .json_utils import dumps, loads
+
+# Seconds between dashboard pushes
+UPDATE_INTERVAL = 5
 
 
 class DashboardConsumer(AsyncWebsocketConsumer):
     async def connect(self):
+        # Last message sent per update type, to skip unchanged pushes
+        self.last_sent = {}
+
         await self.channel_layer.group_add("dashboard_updates", self.channel_name)
         await self.accept()
 
@@ -27,7 +33,7 @@ class DashboardConsumer(AsyncWebsocketConsumer):
             self.update_task.cancel()
 
     async def receive(self, text_data):
-        data = json.loads(text_data)
+        data = loads(text_data)
         message_type = data.get("type")
 
         if message_type == "get_services":
@@ -41,80 +47,78 @@ class DashboardConsumer(AsyncWebsocketConsumer):
         """Send periodic updates to the client"""
         while True:
             try:
-                await asyncio.sleep(5)  # Update every 5 seconds
-                await self.send_services_update()
-                await self.send_nodes_update()
-                await self.send_system_info_update()
+                await asyncio.sleep(UPDATE_INTERVAL)
+                # One Docker snapshot per cycle feeds every section, and only
+                # sections that changed since the last push are sent
+                data = await self.get_docker_data()
+                await self.send_services_update(data, only_changed=True)
+                await self.send_nodes_update(data, only_changed=True)
+                await self.send_system_info_update(data, only_changed=True)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 print(f"Error in periodic updates: {e}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(UPDATE_INTERVAL)
 
     @database_sync_to_async
     def get_docker_data(self):
         """Get Docker data synchronously"""
-        docker_manager = DockerSwarmManager()
-        return {
-            "services": docker_manager.get_services(),
-            "nodes": docker_manager.get_nodes(),
-            "system_info": docker_manager.get_system_info(),
-            "swarm_info": docker_manager.get_swarm_info(),
-            "swarm_active": docker_manager.is_swarm_active(),
-        }
-
-    async def send_services_update(self):
+        return get_docker_manager().get_dashboard_bundle()
+
+    async def _send_update(self, message_type, payload, only_changed):
+        """Send one section, skipping it if identical to what was last sent"""
+        text_data = dumps({"type": message_type, "data": payload}).decode()
+        if only_changed and self.last_sent.get(message_type) == text_data:
+            return
+        self.last_sent[message_type] = text_data
+        await self.send(text_data=text_data)
+
+    async def send_services_update(self, data=None, only_changed=False):
         """Send services data to client"""
         try:
-            data = await self.get_docker_data()
-            await self.send(
-                text_data=json.dumps(
-                    {"type": "services_update", "data": data["services"]}
-                )
-            )
+            if data is None:
+                data = await self.get_docker_data()
+            await self._send_update("services_update", data["services"], only_changed)
         except Exception as e:
             await self.send(
-                text_data=json.dumps(
+                text_data=dumps(
                     {
                         "type": "error",
                         "message": f"Failed to get services data: {str(e)}",
                     }
-                )
+                ).decode()
             )
 
-    async def send_nodes_update(self):
+    async def send_nodes_update(self, data=None, only_changed=False):
         """Send nodes data to client"""
         try:
-            data = await self.get_docker_data()
-            await self.send(
-                text_data=json.dumps({"type": "nodes_update", "data": data["nodes"]})
-            )
+            if data is None:
+                data = await self.get_docker_data()
+            await self._send_update("nodes_update", data["nodes"], only_changed)
         except Exception as e:
             await self.send(
-                text_data=json.dumps(
+                text_data=dumps(
                     {"type": "error", "message": f"Failed to get nodes data: {str(e)}"}
-                )
+                ).decode()
             )
 
-    async def send_system_info_update(self):
+    async def send_system_info_update(self, data=None, only_changed=False):
         """Send system info data to client"""
         try:
-            data = await self.get_docker_data()
-            await self.send(
-                text_data=json.dumps(
-                    {
-                        "type": "system_info_update",
-                        "data": {
-                            "system_info": data["system_info"],
-                            "swarm_info": data["swarm_info"],
-                            "swarm_active": data["swarm_active"],
-                        },
-                    }
-                )
+            if data is None:
+                data = await self.get_docker_data()
+            await self._send_update(
+                "system_info_update",
+                {
+                    "system_info": data["system_info"],
+                    "swarm_info": data["swarm_info"],
+                    "swarm_active": data["swarm_active"],
+                },
+                only_changed,
             )
         except Exception as e:
             await self.send(
-                text_data=json.dumps(
+                text_data=dumps(
                     {"type": "error", "message": f"Failed to get system info: {str(e)}"}
-                )
+                ).decode()
             )
@@ -7,15 +7,17 @@ from datetime import datetime, timedelta
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import HttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from .models import Dashboard, DashboardPanel, Metric
-from .analytics import AnalyticsEngine
-from .metrics import MetricsCollector, DashboardBuilder
+from .analytics import get_analytics_engine
+from .concurrency_utils import run_in_parallel
+from .json_utils import FastJsonResponse, loads
+from .metrics import get_dashboard_builder, get_metrics_collector
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +26,13 @@ logger = logging.getLogger(__name__)
 def analytics_dashboard(request):
     """Main analytics dashboard with overview metrics"""
     try:
-        analytics = AnalyticsEngine()
+        analytics = get_analytics_engine()
         
-        # Get overview data
-        resource_trends = analytics.get_resource_usage_trends('24h', '1h')
-        service_analysis = analytics.get_service_performance_analysis(None, '24h')
+        # Get overview data - both queries are independent, so run them together
+        resource_trends, service_analysis = run_in_parallel(
+            lambda: analytics.get_resource_usage_trends('24h', '1h'),
+            lambda: analytics.get_service_performance_analysis(None, '24h'),
+        )
         
         context = {
             'resource_trends': resource_trends,
@@ -52,7 +56,7 @@ def historical_metrics(request):
     measurement = request.GET.get('measurement', 'resource_usage')
     
     try:
-        analytics = AnalyticsEngine()
+        analytics = get_analytics_engine()
         
         if measurement == 'resource_usage' or measurement == 'system_resources':
             data = analytics.get_resource_usage_trends(time_range, '1h')
@@ -95,8 +99,13 @@ def custom_dashboards(request):
     """List and manage custom dashboards"""
     # Get user's dashboards and shared dashboards
     user_dashboards = Dashboard.objects.filter(created_by=request.user)
+    
+    # EXISTS avoids the duplicate rows an M2M join would produce
+    shared_with_user = Dashboard.shared_with.through.objects.filter(
+        dashboard=OuterRef('pk'), user=request.user
+    )
     shared_dashboards = Dashboard.objects.filter(
-        Q(shared_with=request.user) | Q(is_public=True)
+        Q(Exists(shared_with_user)) | Q(is_public=True)
     ).exclude(created_by=request.user)
     
     context = {
@@ -123,7 +132,7 @@ def dashboard_builder(request, dashboard_id=None):
         try:
             name = request.POST.get('name', '')
             description = request.POST.get('description', '')
-            config = json.loads(request.POST.get('config', '{}'))
+            config = loads(request.POST.get('config', '{}'))
             is_public = request.POST.get('is_public') == 'on'
             
             if dashboard:
@@ -191,7 +200,7 @@ def view_dashboard(request, dashboard_id):
     
     try:
         # Get dashboard data
-        dashboard_builder = DashboardBuilder()
+        dashboard_builder = get_dashboard_builder()
         dashboard_data = dashboard_builder.get_dashboard_data(dashboard.config, time_range)
         
         context = {
@@ -227,7 +236,7 @@ def predictive_analytics(request):
     time_range = request.GET.get('range', '30d')
     
     try:
-        analytics = AnalyticsEngine()
+        analytics = get_analytics_engine()
         predictions = analytics.get_predictive_analytics(metric_type, time_range)
         
         context = {
@@ -260,11 +269,11 @@ def predictive_analytics(request):
 def api_metrics_data(request):
     """API endpoint for real-time metrics data"""
     measurement = request.GET.get('measurement', 'system_resources')
-    tags_filter = json.loads(request.GET.get('tags', '{}'))
+    tags_filter = loads(request.GET.get('tags', '{}'))
     time_range = request.GET.get('range', '1h')
     
     try:
-        collector = MetricsCollector()
+        collector = get_metrics_collector()
         
         # Parse time range
         if time_range.endswith('h'):
@@ -276,9 +285,9 @@ def api_metrics_data(request):
         else:
             start_time = timezone.now() - timedelta(hours=1)
         
-        data = collector.get_historical_data(measurement, tags_filter, start_time)
+        data = collector.get_cached_historical_data(measurement, tags_filter, start_time)
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'data': data[-100:],  # Last 100 points
             'measurement': measurement,
@@ -287,7 +296,7 @@ def api_metrics_data(request):
         
     except Exception as e:
         logger.error(f"Error getting metrics data: {e}")
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -299,7 +308,7 @@ def api_dashboard_data(request, dashboard_id):
     dashboard = get_object_or_404(Dashboard, id=dashboard_id)
     
     if not dashboard.can_view(request.user):
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': 'Permission denied'
         }, status=403)
@@ -307,10 +316,10 @@ def api_dashboard_data(request, dashboard_id):
     time_range = request.GET.get('range', '24h')
     
     try:
-        dashboard_builder = DashboardBuilder()
+        dashboard_builder = get_dashboard_builder()
         dashboard_data = dashboard_builder.get_dashboard_data(dashboard.config, time_range)
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'data': dashboard_data,
             'dashboard_id': dashboard_id
@@ -318,7 +327,7 @@ def api_dashboard_data(request, dashboard_id):
         
     except Exception as e:
         logger.error(f"Error getting dashboard data: {e}")
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -331,13 +340,13 @@ def api_share_dashboard(request, dashboard_id):
     dashboard = get_object_or_404(Dashboard, id=dashboard_id)
     
     if not dashboard.can_edit(request.user):
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': 'Permission denied'
         }, status=403)
     
     try:
-        data = json.loads(request.body)
+        data = loads(request.body)
         user_ids = data.get('user_ids', [])
         
         # Add users to shared_with
@@ -347,14 +356,14 @@ def api_share_dashboard(request, dashboard_id):
         users = User.objects.filter(id__in=user_ids)
         dashboard.shared_with.add(*users)
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'shared_count': len(user_ids)
         })
         
     except Exception as e:
         logger.error(f"Error sharing dashboard: {e}")
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -364,7 +373,7 @@ def api_share_dashboard(request, dashboard_id):
 def api_export_data(request):
     """API endpoint to export metrics data"""
     try:
-        data = json.loads(request.body)
+        data = loads(request.body)
         measurements = data.get('measurements', [])
         tags_filter = data.get('tags_filter', {})
         time_range = data.get('time_range', '7d')
@@ -380,7 +389,7 @@ def api_export_data(request):
         else:
             start_time = timezone.now() - timedelta(days=7)
         
-        analytics = AnalyticsEngine()
+        analytics = get_analytics_engine()
         exported_data = analytics.export_metrics_data(
             measurements, tags_filter, start_time, timezone.now(), format_type
         )
@@ -400,11 +409,11 @@ def api_export_data(request):
             response.write('\n'.join(csv_content))
             return response
         else:
-            return JsonResponse(exported_data)
+            return FastJsonResponse(exported_data)
         
     except Exception as e:
         logger.error(f"Error exporting data: {e}")
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -427,14 +436,14 @@ def api_dashboard_templates(request):
                 'created_at': template.created_at.isoformat()
             })
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'templates': template_data
         })
         
     except Exception as e:
         logger.error(f"Error getting dashboard templates: {e}")
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -447,7 +456,7 @@ def api_create_from_template(request, template_id):
     template = get_object_or_404(Dashboard, id=template_id, is_template=True)
     
     try:
-        data = json.loads(request.body)
+        data = loads(request.body)
         name = data.get('name', f"{template.name} - Copy")
         
         # Create new dashboard from template
@@ -458,7 +467,7 @@ def api_create_from_template(request, template_id):
             created_by=request.user
         )
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'dashboard_id': new_dashboard.id,
             'dashboard_name': new_dashboard.name
@@ -466,7 +475,7 @@ def api_create_from_template(request, template_id):
         
     except Exception as e:
         logger.error(f"Error creating dashboard from template: {e}")
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -479,7 +488,7 @@ def api_delete_dashboard(request, dashboard_id):
     dashboard = get_object_or_404(Dashboard, id=dashboard_id)
     
     if not dashboard.can_edit(request.user):
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': 'Permission denied'
         }, status=403)
@@ -488,14 +497,14 @@ def api_delete_dashboard(request, dashboard_id):
         dashboard_name = dashboard.name
         dashboard.delete()
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': f'Dashboard "{dashboard_name}" deleted successfully'
         })
         
     except Exception as e:
         logger.error(f"Error deleting dashboard: {e}")
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Minimal keep-alive HTTP/1.1 client for read-only Docker Engine API calls
+over the local Unix socket
+"""
+
+import socket
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+from .json_utils import loads
+
+
+class DockerSocketError(Exception):
+    """Raised when the Docker socket returns an unusable response"""
+
+
+class UnixSocketHTTPClient:
+    """Issue GET requests against the Docker Unix socket without requests/urllib3"""
+
+    def __init__(self, socket_path: str, api_version: str, timeout: float = 10):
+        self.socket_path = socket_path
+        self.api_version = api_version
+        self.timeout = timeout
+        # One connection per thread, kept alive between requests
+        self._local = threading.local()
+
+    def get(self, path: str, params: Optional[Dict] = None) -> Any:
+        """GET an API path and return the decoded JSON body"""
+        query = f"?{urlencode(params)}" if params else ""
+        request = (
+            f"GET /v{self.api_version}{path}{query} HTTP/1.1\r\n"
+            "Host: docker\r\n"
+            "Connection: keep-alive\r\n"
+            "\r\n"
+        ).encode()
+
+        # A kept-alive connection may have been closed by the daemon; retry once
+        for attempt in range(2):
+            reused = getattr(self._local, "sock", None) is not None
+            try:
+                sock, reader = self._connection()
+                sock.sendall(request)
+                status, headers = self._read_head(reader)
+                body = self._read_body(reader, headers)
+            except (OSError, ValueError, DockerSocketError):
+                self.close()
+                if attempt or not reused:
+                    raise
+                continue
+
+            if headers.get("connection", "").lower() == "close":
+                self.close()
+
+            if status != 200:
+                raise DockerSocketError(f"Docker API returned {status} for {path}")
+
+            return loads(body)
+
+    def close(self):
+        """Close this thread's connection"""
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                self._local.reader.close()
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+        self._local.reader = None
+
+    def _connection(self):
+        """Get this thread's connection, opening it if needed"""
+        if getattr(self._local, "sock", None) is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+            self._local.reader = sock.makefile("rb")
+        return self._local.sock, self._local.reader
+
+    def _read_head(self, reader):
+        """Read the status line and headers"""
+        status_line = reader.readline()
+        if not status_line:
+            raise DockerSocketError("Connection closed by Docker daemon")
+
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise DockerSocketError(f"Malformed status line: {status_line!r}")
+
+        headers = {}
+        while True:
+            line = reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        return status, headers
+
+    def _read_body(self, reader, headers: Dict[str, str]) -> bytes:
+        """Read a Content-Length, chunked or close-delimited body"""
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(reader.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    # Skip any trailer headers
+                    while reader.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(self._read_exact(reader, size))
+                reader.readline()
+            return b"".join(chunks)
+
+        if "content-length" in headers:
+            return self._read_exact(reader, int(headers["content-length"]))
+
+        body = reader.read()
+        self.close()
+        return body
+
+    def _read_exact(self, reader, size: int) -> bytes:
+        """Read exactly ``size`` bytes"""
+        data = reader.read(size)
+        if len(data) != size:
+            raise DockerSocketError("Truncated response from Docker daemon")
+        return data
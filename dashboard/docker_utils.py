@@ -2,41 +2,381 @@
 Docker Swarm management utilities
 """
 
+import codecs
+import functools
+import hashlib
+import inspect
+import json
 import logging
-from typing import Dict, List, Optional
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern
 
 import docker
-from django.conf import settings
+from django.core.cache import cache
+
+from .concurrency_utils import map_in_parallel, run_in_parallel
+from .docker_socket import UnixSocketHTTPClient
+from .json_utils import dumps
 
 logger = logging.getLogger(__name__)
 
 
+# Connection pool size; concurrent Docker calls are bounded by it
+DOCKER_MAX_POOL_SIZE = 16
+
+# Read size for file-like log responses
+LOG_READ_CHUNK_SIZE = 64 * 1024
+
+# /info is requested several times per page render; reuse it briefly
+INFO_CACHE_TTL = 1.0
+INFO_CACHE_KEY = "docker:info"
+
+# Service and node lists are reused while the swarm version index is unchanged.
+# Task state changes do not bump the index, so entries also expire after a TTL.
+LIST_CACHE_TTL = 5.0
+
+# Window of each background host CPU sample
+CPU_SAMPLE_INTERVAL = 1.0
+
+# Label `docker stack deploy` puts on every object it creates
+STACK_NAMESPACE_LABEL = "com.docker.stack.namespace"
+
+# Pause before restarting a dropped Docker event stream
+EVENT_WATCHER_RETRY_DELAY = 30.0
+
+# Concurrent service removals when tearing down a stack
+STACK_REMOVE_WORKERS = 8
+
+
+def build_log_filter(level: str = "", search: str = "") -> Optional[Pattern]:
+    """Compile log level and search text into one case-insensitive pattern"""
+    conditions = []
+    if level:
+        conditions.append(rf"(?=.*\b{re.escape(level)}\b)")
+    if search:
+        conditions.append(rf"(?=.*{re.escape(search)})")
+
+    if not conditions:
+        return None
+
+    return re.compile("^" + "".join(conditions), re.IGNORECASE)
+
+
+class LogStream:
+    """Iterator over the lines of one Docker log response"""
+
+    def __init__(self, response, lines):
+        self._response = response
+        self._lines = lines
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._lines)
+
+    def close(self):
+        """Release the Docker connection; unblocks a read pending in another thread"""
+        close = getattr(self._response, "close", None)
+        if close is not None:
+            close()
+
+
+@dataclass(slots=True, frozen=True)
+class ServiceInfo:
+    """Summary of a swarm service"""
+
+    id: str
+    name: str
+    image: str
+    replicas: int
+    mode: str
+    created: str
+    updated: str
+    ports: List[Dict] = field(default_factory=list)
+    networks: List[str] = field(default_factory=list)
+    labels: Dict[str, str] = field(default_factory=dict)
+    running_tasks: int = 0
+    total_tasks: int = 0
+
+
+@dataclass(slots=True, frozen=True)
+class NodeInfo:
+    """Summary of a swarm node"""
+
+    id: str
+    hostname: str
+    status: str
+    availability: str
+    role: str
+    engine_version: str
+    platform: str
+    architecture: str
+    resources: Dict[str, float]
+    leader: bool = False
+    manager_addr: Optional[str] = None
+
+
+@dataclass(slots=True, frozen=True)
+class TaskInfo:
+    """Summary of a service task and its container"""
+
+    task_id: str
+    node_id: str
+    state: str
+    desired_state: str
+    created_at: str
+    updated_at: str
+    container_id: Optional[str] = None
+    container_name: Optional[str] = None
+    container_status: Optional[str] = None
+
+
+_client_singleton = None
+_client_singleton_pid = None
+_socket_client_singleton = None
+_client_lock = threading.Lock()
+
+_list_cache: Dict[str, tuple] = {}
+_list_cache_lock = threading.Lock()
+
+# One lock per cached Docker query so concurrent misses share a single fetch
+_fetch_locks: Dict[str, threading.Lock] = {}
+
+# (monotonic time, /info response) shared by every manager in the process
+_info_snapshot = None
+
+# Manager shared by views; rebuilt whenever _get_client() hands out a new client
+_manager_singleton = None
+
+
+def _fetch_lock(key: str) -> threading.Lock:
+    """Lock serializing cache refills of ``key``"""
+    with _list_cache_lock:
+        return _fetch_locks.setdefault(key, threading.Lock())
+
+
+def _fresh_list_entry(key: str, version) -> Optional[tuple]:
+    """Cached list entry for ``key`` if it matches the swarm version and TTL"""
+    entry = _list_cache.get(key)
+    if (
+        entry
+        and version is not None
+        and entry[0] == version
+        and time.monotonic() - entry[1] < LIST_CACHE_TTL
+    ):
+        return entry
+    return None
+
+
+def invalidate_list_cache():
+    """Drop the cached service and node lists after a swarm mutation"""
+    global _info_snapshot
+    with _list_cache_lock:
+        _list_cache.clear()
+    # The swarm version index changes with the mutation
+    _info_snapshot = None
+    cache.delete(INFO_CACHE_KEY)
+
+
+def _docker_op(success_message: str, error_message: str):
+    """Wrap a swarm mutation with the client guard, logging and cache invalidation
+
+    Messages are %-style templates formatted lazily with the wrapped
+    method's arguments. The method may return False to report failure
+    without raising.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        error_template = error_message + ": %(error)s"
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            arguments = signature.bind(self, *args, **kwargs).arguments
+            try:
+                if not self.client:
+                    return False
+
+                if func(self, *args, **kwargs) is False:
+                    return False
+
+                invalidate_list_cache()
+                logger.info(success_message, arguments)
+                return True
+            except Exception as e:
+                logger.error(error_template, {**arguments, "error": e})
+                return False
+
+        return wrapper
+
+    return decorator
+
+
+def _connect_client():
+    """Create and ping a new Docker client, or return None if unavailable"""
+    try:
+        # Try to connect to Docker without TLS first
+        try:
+            client = docker.DockerClient(
+                base_url="unix://var/run/docker.sock", max_pool_size=DOCKER_MAX_POOL_SIZE
+            )
+            client.ping()
+            logger.info("Docker client connected successfully via Unix socket")
+        except Exception:
+            # Fallback to from_env for other configurations
+            client = docker.from_env(max_pool_size=DOCKER_MAX_POOL_SIZE)
+            client.ping()
+            logger.info("Docker client connected successfully via environment")
+        return client
+    except Exception as e:
+        logger.error("Failed to connect to Docker: %s", e)
+        return None
+
+
+def _create_socket_client(client) -> Optional[UnixSocketHTTPClient]:
+    """Create a raw socket client when the Docker client talks to a Unix socket"""
+    adapter = getattr(client.api, "_custom_adapter", None)
+    socket_path = getattr(adapter, "socket_path", None)
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+    return UnixSocketHTTPClient(socket_path, client.api.api_version)
+
+
+def _get_client():
+    """Get the per-process Docker client, connecting on first use"""
+    global _client_singleton, _client_singleton_pid, _socket_client_singleton
+
+    # Forked workers must not share the parent's socket connections
+    pid = os.getpid()
+    if _client_singleton is not None and _client_singleton_pid == pid:
+        return _client_singleton
+
+    with _client_lock:
+        if _client_singleton is None or _client_singleton_pid != pid:
+            client = _connect_client()
+            if client is None:
+                return None
+            _client_singleton = client
+            _socket_client_singleton = _create_socket_client(client)
+            _client_singleton_pid = pid
+        return _client_singleton
+
+
+_cpu_sample = None
+_cpu_sampler_pid = None
+_cpu_sampler_lock = threading.Lock()
+
+
+def _sample_cpu_forever(psutil):
+    """Keep the latest host CPU percentage, one window after another"""
+    global _cpu_sample
+    while True:
+        _cpu_sample = psutil.cpu_percent(interval=CPU_SAMPLE_INTERVAL)
+
+
+def latest_cpu_percent() -> float:
+    """Get host CPU usage from the background sampler without waiting a window"""
+    global _cpu_sampler_pid
+    import psutil
+
+    # Forked workers need their own sampler thread
+    pid = os.getpid()
+    if _cpu_sampler_pid != pid:
+        with _cpu_sampler_lock:
+            if _cpu_sampler_pid != pid:
+                threading.Thread(
+                    target=_sample_cpu_forever, args=(psutil,), name="cpu-sampler", daemon=True
+                ).start()
+                _cpu_sampler_pid = pid
+
+    sample = _cpu_sample
+    if sample is None:
+        # Nothing sampled yet in this process; take one short reading
+        return psutil.cpu_percent(interval=0.1)
+    return sample
+
+
 class DockerSwarmManager:
     def __init__(self):
-        try:
-            # Try to connect to Docker without TLS first
+        self.client = _get_client()
+        self._socket_client = _socket_client_singleton if self.client else None
+
+    def _fast_get(self, path: str, fallback, params: Optional[Dict] = None):
+        """GET a read-only API path over the raw socket, falling back to docker-py"""
+        if self._socket_client is not None:
             try:
-                self.client = docker.DockerClient(base_url="unix://var/run/docker.sock")
-                self.client.ping()
-                logger.info("Docker client connected successfully via Unix socket")
-            except Exception:
-                # Fallback to from_env for other configurations
-                self.client = docker.from_env()
-                self.client.ping()
-                logger.info("Docker client connected successfully via environment")
-        except Exception as e:
-            logger.error(f"Failed to connect to Docker: {e}")
-            self.client = None
+                return self._socket_client.get(path, params)
+            except Exception as e:
+                logger.warning("Raw socket request for %s failed, using docker-py: %s", path, e)
+        return fallback()
+
+    def _info(self, ttl: float = INFO_CACHE_TTL) -> Dict:
+        """Get Docker engine info, reusing a recent response within the TTL"""
+        global _info_snapshot
+        snapshot = _info_snapshot
+        if snapshot and time.monotonic() - snapshot[0] < ttl:
+            return snapshot[1]
+
+        with _fetch_lock(INFO_CACHE_KEY):
+            # Another thread may have refreshed it while this one waited
+            snapshot = _info_snapshot
+            if snapshot and time.monotonic() - snapshot[0] < ttl:
+                return snapshot[1]
+
+            # Share the response between worker processes through the Django cache
+            info = cache.get(INFO_CACHE_KEY)
+            if info is None:
+                info = self._fast_get("/info", self.client.info)
+                cache.set(INFO_CACHE_KEY, info, ttl)
+
+            _info_snapshot = (time.monotonic(), info)
+            return info
+
+    def _cached_list(self, key: str, fetch) -> List:
+        """Return a cached list while the swarm version index is unchanged"""
+        version = (
+            self._info().get("Swarm", {}).get("Cluster", {}).get("Version", {}).get("Index")
+        )
+        entry = _fresh_list_entry(key, version)
+        if entry:
+            return list(entry[2])
+
+        # Concurrent misses wait for the first caller's fetch instead of
+        # each hitting the daemon
+        with _fetch_lock(key):
+            entry = _fresh_list_entry(key, version)
+            if entry:
+                return list(entry[2])
+
+            data = fetch()
+            # Serialize and fingerprint the list once per fetch so API polls can
+            # reuse the bytes or be answered with a 304
+            body = dumps(data)
+            etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+            with _list_cache_lock:
+                _list_cache[key] = (version, time.monotonic(), data, etag, body)
+            return list(data)
+
+    def cached_list_json(self, key: str) -> Optional[tuple]:
+        """(etag, JSON bytes) of the cached list under ``key``, if any"""
+        entry = _list_cache.get(key)
+        return entry[3:] if entry else None
 
     def is_swarm_active(self) -> bool:
         """Check if Docker Swarm mode is active"""
         try:
             if not self.client:
                 return False
-            swarm_info = self.client.info().get("Swarm", {})
+            swarm_info = self._info().get("Swarm", {})
             return swarm_info.get("LocalNodeState") == "active"
         except Exception as e:
-            logger.error(f"Error checking swarm status: {e}")
+            logger.error("Error checking swarm status: %s", e)
             return False
 
     def get_swarm_info(self) -> Dict:
@@ -45,7 +385,7 @@ class DockerSwarmManager:
             if not self.client or not self.is_swarm_active():
                 return {}
 
-            info = self.client.info()
+            info = self._info()
             swarm_info = info.get("Swarm", {})
 
             return {
@@ -61,92 +401,109 @@ class DockerSwarmManager:
                 .get("Index"),
             }
         except Exception as e:
-            logger.error(f"Error getting swarm info: {e}")
+            logger.error("Error getting swarm info: %s", e)
             return {}
 
-    def get_nodes(self) -> List[Dict]:
+    def get_nodes(self) -> List[NodeInfo]:
         """Get all nodes in the swarm"""
         try:
             if not self.client or not self.is_swarm_active():
                 return []
 
-            nodes = []
-            for node in self.client.nodes.list():
-                node_info = {
-                    "id": node.id,
-                    "hostname": node.attrs["Description"]["Hostname"],
-                    "status": node.attrs["Status"]["State"],
-                    "availability": node.attrs["Spec"]["Availability"],
-                    "role": node.attrs["Spec"]["Role"],
-                    "engine_version": node.attrs["Description"]["Engine"][
-                        "EngineVersion"
-                    ],
-                    "platform": node.attrs["Description"]["Platform"]["OS"],
-                    "architecture": node.attrs["Description"]["Platform"][
-                        "Architecture"
-                    ],
-                    "resources": {
-                        "cpu": node.attrs["Description"]["Resources"]["NanoCPUs"]
-                        / 1000000000,
-                        "memory": node.attrs["Description"]["Resources"]["MemoryBytes"]
-                        / (1024**3),
-                    },
-                    "leader": node.attrs.get("ManagerStatus", {}).get("Leader", False),
-                    "manager_addr": node.attrs.get("ManagerStatus", {}).get("Addr"),
-                }
-                nodes.append(node_info)
-            return nodes
+            return self._cached_list("nodes", self._fetch_nodes)
         except Exception as e:
-            logger.error(f"Error getting nodes: {e}")
+            logger.error("Error getting nodes: %s", e)
             return []
 
-    def get_services(self) -> List[Dict]:
+    def _fetch_nodes(self) -> List[NodeInfo]:
+        """Fetch and flatten all swarm nodes"""
+        nodes = []
+        for node in self._fast_get("/nodes", self.client.api.nodes):
+            # Resolve each nested section once instead of per field
+            description = node["Description"]
+            spec = node["Spec"]
+            platform = description["Platform"]
+            resources = description["Resources"]
+            manager_status = node.get("ManagerStatus", {})
+
+            nodes.append(
+                NodeInfo(
+                    id=node["ID"],
+                    hostname=description["Hostname"],
+                    status=node["Status"]["State"],
+                    availability=spec["Availability"],
+                    role=spec["Role"],
+                    engine_version=description["Engine"]["EngineVersion"],
+                    platform=platform["OS"],
+                    architecture=platform["Architecture"],
+                    resources={
+                        "cpu": resources["NanoCPUs"] / 1000000000,
+                        "memory": resources["MemoryBytes"] / (1024**3),
+                    },
+                    leader=manager_status.get("Leader", False),
+                    manager_addr=manager_status.get("Addr"),
+                )
+            )
+        return nodes
+
+    def get_services(self) -> List[ServiceInfo]:
         """Get all services in the swarm"""
         try:
             if not self.client or not self.is_swarm_active():
                 return []
 
-            services = []
-            for service in self.client.services.list():
-                service_info = {
-                    "id": service.id,
-                    "name": service.name,
-                    "image": service.attrs["Spec"]["TaskTemplate"]["ContainerSpec"][
-                        "Image"
-                    ],
-                    "replicas": service.attrs["Spec"].get("Replicas", 0),
-                    "mode": (
+            return self._cached_list("services", self._fetch_services)
+        except Exception as e:
+            logger.error("Error getting services: %s", e)
+            return []
+
+    def _fetch_services(self) -> List[ServiceInfo]:
+        """Fetch all services with their task counts"""
+        # Fetch all tasks in one request alongside the services and tally
+        # them per service in one pass
+        tasks, raw_services = run_in_parallel(
+            lambda: self._fast_get("/tasks", self.client.api.tasks),
+            lambda: self._fast_get("/services", self.client.api.services),
+        )
+        total_tasks = Counter()
+        running_tasks = Counter()
+        for task in tasks:
+            service_id = task.get("ServiceID")
+            total_tasks[service_id] += 1
+            if task["Status"]["State"] == "running":
+                running_tasks[service_id] += 1
+
+        services = []
+        for service in raw_services:
+            service_id = service["ID"]
+            services.append(
+                ServiceInfo(
+                    id=service_id,
+                    name=service["Spec"]["Name"],
+                    image=service["Spec"]["TaskTemplate"]["ContainerSpec"]["Image"],
+                    replicas=service["Spec"].get("Replicas", 0),
+                    mode=(
                         "replicated"
-                        if "Replicas" in service.attrs["Spec"]
+                        if "Replicas" in service["Spec"]
                         else "global"
                     ),
-                    "created": service.attrs["CreatedAt"],
-                    "updated": service.attrs["UpdatedAt"],
-                    "ports": self._extract_ports(
-                        service.attrs["Spec"].get("EndpointSpec", {})
+                    created=service["CreatedAt"],
+                    updated=service["UpdatedAt"],
+                    ports=self._extract_ports(
+                        service["Spec"].get("EndpointSpec", {})
                     ),
-                    "networks": [
+                    networks=[
                         net["Target"]
-                        for net in service.attrs["Spec"]["TaskTemplate"].get(
+                        for net in service["Spec"]["TaskTemplate"].get(
                             "Networks", []
                         )
                     ],
-                    "labels": service.attrs["Spec"].get("Labels", {}),
-                }
-
-                # Get task information
-                tasks = service.tasks()
-                running_tasks = sum(
-                    1 for task in tasks if task["Status"]["State"] == "running"
+                    labels=service["Spec"].get("Labels", {}),
+                    running_tasks=running_tasks[service_id],
+                    total_tasks=total_tasks[service_id],
                 )
-                service_info["running_tasks"] = running_tasks
-                service_info["total_tasks"] = len(tasks)
-
-                services.append(service_info)
-            return services
-        except Exception as e:
-            logger.error(f"Error getting services: {e}")
-            return []
+            )
+        return services
 
     def get_service_details(self, service_id: str) -> Optional[Dict]:
         """Get detailed information about a specific service"""
@@ -154,85 +511,118 @@ class DockerSwarmManager:
             if not self.client:
                 return None
 
-            service = self.client.services.get(service_id)
-            tasks = service.tasks()
-
-            return {"service": service.attrs, "tasks": [task for task in tasks]}
+            # The service and its tasks are independent round-trips
+            service, tasks = run_in_parallel(
+                lambda: self.client.api.inspect_service(service_id),
+                lambda: self._service_tasks(service_id),
+            )
+            return {"service": service, "tasks": tasks}
         except Exception as e:
-            logger.error(f"Error getting service details: {e}")
+            logger.error("Error getting service details: %s", e)
             return None
 
+    def _update_service_spec(self, service_id: str, change_spec) -> None:
+        """Inspect a service once, apply a change to its spec and submit it"""
+        service = self.client.api.inspect_service(service_id)
+        spec = service["Spec"]
+        change_spec(spec)
+
+        # update_service replaces the whole spec, so pass every section back
+        kwargs = {}
+        if "RollbackConfig" in spec:
+            kwargs["rollback_config"] = spec["RollbackConfig"]
+        self.client.api.update_service(
+            service_id,
+            service["Version"]["Index"],
+            task_template=spec.get("TaskTemplate"),
+            name=spec.get("Name"),
+            labels=spec.get("Labels"),
+            mode=spec.get("Mode"),
+            update_config=spec.get("UpdateConfig"),
+            networks=spec.get("Networks"),
+            endpoint_spec=spec.get("EndpointSpec"),
+            **kwargs,
+        )
+
+    @_docker_op("Service %(service_id)s restarted successfully", "Error restarting service %(service_id)s")
     def restart_service(self, service_id: str) -> bool:
         """Restart a service"""
-        try:
-            if not self.client:
-                return False
 
-            service = self.client.services.get(service_id)
-            service.force_update()
-            logger.info(f"Service {service_id} restarted successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Error restarting service {service_id}: {e}")
-            return False
+        def force_update(spec):
+            task_template = spec["TaskTemplate"]
+            task_template["ForceUpdate"] = task_template.get("ForceUpdate", 0) + 1
+
+        self._update_service_spec(service_id, force_update)
 
+    @_docker_op("Service %(service_id)s scaled to %(replicas)s replicas", "Error scaling service %(service_id)s")
     def scale_service(self, service_id: str, replicas: int) -> bool:
         """Scale a service to specified number of replicas"""
-        try:
-            if not self.client:
-                return False
 
-            service = self.client.services.get(service_id)
-            service.scale(replicas)
-            logger.info(f"Service {service_id} scaled to {replicas} replicas")
-            return True
-        except Exception as e:
-            logger.error(f"Error scaling service {service_id}: {e}")
-            return False
+        def set_replicas(spec):
+            if "Replicated" not in spec.get("Mode", {}):
+                raise ValueError("Cannot scale a global service")
+            spec["Mode"] = {"Replicated": {"Replicas": replicas}}
+
+        self._update_service_spec(service_id, set_replicas)
 
+    @_docker_op("Service %(service_id)s removed successfully", "Error removing service %(service_id)s")
     def remove_service(self, service_id: str) -> bool:
         """Remove a service"""
-        try:
-            if not self.client:
-                return False
-
-            service = self.client.services.get(service_id)
-            service.remove()
-            logger.info(f"Service {service_id} removed successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Error removing service {service_id}: {e}")
-            return False
+        self.client.api.remove_service(service_id)
+
+    @_docker_op("Stack %(name)s removed successfully", "Error removing stack %(name)s")
+    def remove_stack(self, name: str) -> bool:
+        """Remove a stack's services, secrets, configs and networks like `docker stack rm`"""
+        api = self.client.api
+        filters = {"label": f"{STACK_NAMESPACE_LABEL}={name}"}
+
+        # Service removals are independent; issue them concurrently
+        map_in_parallel(
+            lambda service: api.remove_service(service["ID"]),
+            api.services(filters=filters),
+            max_workers=STACK_REMOVE_WORKERS,
+        )
+        for secret in api.secrets(filters=filters):
+            api.remove_secret(secret["ID"])
+        for config in api.configs(filters=filters):
+            api.remove_config(config["ID"])
+
+        # Networks can briefly stay attached to stopping tasks; like the CLI,
+        # report those and carry on
+        for network in api.networks(filters=filters):
+            try:
+                api.remove_network(network["Id"])
+            except docker.errors.APIError as e:
+                logger.warning("Failed to remove network %s: %s", network["Name"], e)
 
+    @_docker_op("Service %(name)s created successfully", "Error creating service %(name)s")
     def create_service(
         self, image: str, name: str, replicas: int = 1, **kwargs
     ) -> bool:
         """Create a new service"""
-        try:
-            if not self.client or not self.is_swarm_active():
-                return False
-
-            # Create service using the simpler approach
-            self.client.services.create(
-                image,
-                name=name,
-                mode=docker.types.ServiceMode("replicated", replicas=replicas),
-            )
-            logger.info(f"Service {name} created successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Error creating service {name}: {e}")
+        if not self.is_swarm_active():
             return False
 
+        # Create service using the simpler approach
+        self.client.api.create_service(
+            docker.types.TaskTemplate(container_spec=docker.types.ContainerSpec(image)),
+            name=name,
+            mode=docker.types.ServiceMode("replicated", replicas=replicas),
+        )
+
     def get_service_logs(
-        self, service_id: str, lines: int = 100, since: str = None
+        self,
+        service_id: str,
+        lines: int = 100,
+        since: str = None,
+        line_filter: Optional[Pattern] = None,
     ) -> Dict:
         """Get logs for a specific service"""
         try:
             if not self.client:
                 return {"logs": [], "error": "Docker client not available"}
 
-            service = self.client.services.get(service_id)
+            spec = self.client.api.inspect_service(service_id)["Spec"]
 
             # Get service logs
             kwargs = {"stdout": True, "stderr": True, "timestamps": True, "tail": lines}
@@ -240,51 +630,36 @@ class DockerSwarmManager:
             if since:
                 kwargs["since"] = since
 
-            # Get logs - this returns a generator, we need to read it properly
-            logs_generator = service.logs(**kwargs)
-
-            # Parse logs
-            log_lines = []
-            try:
-                # Read from the generator and decode
-                if hasattr(logs_generator, "read"):
-                    # It's a file-like object
-                    log_content = logs_generator.read()
-                elif hasattr(logs_generator, "__iter__"):
-                    # It's a generator/iterator
-                    log_content = b"".join(logs_generator)
-                else:
-                    # It's already bytes
-                    log_content = logs_generator
-
-                if log_content:
-                    log_text = log_content.decode("utf-8", errors="ignore")
-                    for line in log_text.split("\n"):
-                        if line.strip():
-                            log_lines.append(line.strip())
-            except Exception as parse_error:
-                logger.error(f"Error parsing service logs: {parse_error}")
-                return {"logs": [], "error": f"Error parsing logs: {str(parse_error)}"}
+            # Get logs - this returns a generator of raw chunks
+            logs_generator = self.client.api.service_logs(
+                service_id,
+                is_tty=spec["TaskTemplate"]["ContainerSpec"].get("TTY", False),
+                **kwargs,
+            )
 
             return {
-                "logs": log_lines,
-                "service_name": service.name,
+                "logs": self._read_log_lines(logs_generator, lines, line_filter),
+                "service_name": spec["Name"],
                 "service_id": service_id,
             }
 
         except Exception as e:
-            logger.error(f"Error getting service logs for {service_id}: {e}")
+            logger.error("Error getting service logs for %s: %s", service_id, e)
             return {"logs": [], "error": str(e)}
 
     def get_container_logs(
-        self, container_id: str, lines: int = 100, since: str = None
+        self,
+        container_id: str,
+        lines: int = 100,
+        since: str = None,
+        line_filter: Optional[Pattern] = None,
     ) -> Dict:
         """Get logs for a specific container"""
         try:
             if not self.client:
                 return {"logs": [], "error": "Docker client not available"}
 
-            container = self.client.containers.get(container_id)
+            container = self.client.api.inspect_container(container_id)
 
             kwargs = {"stdout": True, "stderr": True, "timestamps": True, "tail": lines}
 
@@ -292,96 +667,156 @@ class DockerSwarmManager:
                 kwargs["since"] = since
 
             # Get logs - handle both bytes and generator responses
-            logs_response = container.logs(**kwargs)
-
-            # Parse logs
-            log_lines = []
-            try:
-                # Handle different response types
-                if hasattr(logs_response, "read"):
-                    # It's a file-like object
-                    log_content = logs_response.read()
-                elif hasattr(logs_response, "__iter__") and not isinstance(
-                    logs_response, (str, bytes)
-                ):
-                    # It's a generator/iterator
-                    log_content = b"".join(logs_response)
-                else:
-                    # It's already bytes or string
-                    log_content = logs_response
-
-                if log_content:
-                    if isinstance(log_content, bytes):
-                        log_text = log_content.decode("utf-8", errors="ignore")
-                    else:
-                        log_text = str(log_content)
-
-                    for line in log_text.split("\n"):
-                        if line.strip():
-                            log_lines.append(line.strip())
-            except Exception as parse_error:
-                logger.error(f"Error parsing container logs: {parse_error}")
-                return {"logs": [], "error": f"Error parsing logs: {str(parse_error)}"}
+            logs_response = self.client.api.logs(container_id, **kwargs)
 
             return {
-                "logs": log_lines,
-                "container_name": container.name,
+                "logs": self._read_log_lines(logs_response, lines, line_filter),
+                "container_name": container["Name"].lstrip("/"),
                 "container_id": container_id,
             }
 
         except Exception as e:
-            logger.error(f"Error getting container logs for {container_id}: {e}")
+            logger.error("Error getting container logs for %s: %s", container_id, e)
             return {"logs": [], "error": str(e)}
 
-    def get_service_tasks_with_containers(self, service_id: str) -> List[Dict]:
+    def _iter_log_chunks(self, logs_response):
+        """Yield raw chunks from any of the log response types docker-py returns"""
+        if isinstance(logs_response, (bytes, str)):
+            yield logs_response
+        elif hasattr(logs_response, "read"):
+            # It's a file-like object
+            while True:
+                chunk = logs_response.read(LOG_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            # It's a generator/iterator
+            yield from logs_response
+
+    def _iter_log_lines(self, logs_response, line_filter: Optional[Pattern] = None):
+        """Decode log output incrementally and yield non-empty, matching lines"""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        pending = ""
+
+        for chunk in self._iter_log_chunks(logs_response):
+            text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+            *complete, pending = (pending + text).split("\n")
+            # Strip each line once and drop blanks in a single pass
+            stripped = [line for line in map(str.strip, complete) if line]
+            yield from (
+                stripped if line_filter is None else filter(line_filter.search, stripped)
+            )
+
+        pending = (pending + decoder.decode(b"", final=True)).strip()
+        if pending and (line_filter is None or line_filter.search(pending)):
+            yield pending
+
+    def _read_log_lines(
+        self, logs_response, lines: int, line_filter: Optional[Pattern] = None
+    ) -> List[str]:
+        """Decode log output incrementally, keeping at most the last ``lines`` lines"""
+        return list(deque(self._iter_log_lines(logs_response, line_filter), maxlen=lines))
+
+    def stream_service_logs(
+        self,
+        service_id: str,
+        tail: int = 100,
+        line_filter: Optional[Pattern] = None,
+        follow: bool = True,
+        since: str = None,
+    ) -> LogStream:
+        """Open a service's log lines as Docker produces them, following by default"""
+        if not self.client:
+            return LogStream(None, iter(()))
+
+        kwargs = {"since": since} if since else {}
+        spec = self.client.api.inspect_service(service_id)["Spec"]
+        logs_response = self.client.api.service_logs(
+            service_id,
+            follow=follow,
+            stdout=True,
+            stderr=True,
+            timestamps=True,
+            tail=tail,
+            is_tty=spec["TaskTemplate"]["ContainerSpec"].get("TTY", False),
+            **kwargs,
+        )
+        return LogStream(logs_response, self._iter_log_lines(logs_response, line_filter))
+
+    def get_service_tasks_with_containers(self, service_id: str) -> List[TaskInfo]:
         """Get service tasks with their container information"""
         try:
             if not self.client:
                 return []
 
-            service = self.client.services.get(service_id)
-            tasks = service.tasks()
+            tasks = self._service_tasks(service_id)
 
-            task_info = []
-            for task in tasks:
-                container_id = (
-                    task.get("Status", {}).get("ContainerStatus", {}).get("ContainerID")
-                )
+            container_ids = [
+                task.get("Status", {}).get("ContainerStatus", {}).get("ContainerID")
+                for task in tasks
+            ]
 
-                task_data = {
-                    "task_id": task["ID"],
-                    "node_id": task["NodeID"],
-                    "state": task["Status"]["State"],
-                    "desired_state": task["DesiredState"],
-                    "created_at": task["CreatedAt"],
-                    "updated_at": task["UpdatedAt"],
-                    "container_id": container_id,
-                }
+            # Look up all task containers in a single list request
+            unique_ids = [cid for cid in dict.fromkeys(container_ids) if cid]
+            containers = {
+                container["Id"]: container for container in self._get_containers(unique_ids)
+            }
 
+            task_info = []
+            for task, container_id in zip(tasks, container_ids):
                 # Get container info if available
-                if container_id:
-                    try:
-                        container = self.client.containers.get(container_id)
-                        task_data["container_name"] = container.name
-                        task_data["container_status"] = container.status
-                    except Exception:
-                        pass
-
-                task_info.append(task_data)
+                container = containers.get(container_id)
+
+                task_info.append(
+                    TaskInfo(
+                        task_id=task["ID"],
+                        node_id=task["NodeID"],
+                        state=task["Status"]["State"],
+                        desired_state=task["DesiredState"],
+                        created_at=task["CreatedAt"],
+                        updated_at=task["UpdatedAt"],
+                        container_id=container_id,
+                        container_name=(
+                            container["Names"][0].lstrip("/") if container else None
+                        ),
+                        container_status=container["State"] if container else None,
+                    )
+                )
 
             return task_info
 
         except Exception as e:
-            logger.error(f"Error getting service tasks for {service_id}: {e}")
+            logger.error("Error getting service tasks for %s: %s", service_id, e)
+            return []
+
+    def _service_tasks(self, service_id: str) -> List[Dict]:
+        """Get the raw task dicts for one service"""
+        return self._fast_get(
+            "/tasks",
+            lambda: self.client.api.tasks(filters={"service": service_id}),
+            {"filters": json.dumps({"service": [service_id]})},
+        )
+
+    def _get_containers(self, container_ids: List[str]) -> List[Dict]:
+        """List the given containers present on this node"""
+        if not container_ids:
             return []
 
+        filters = {"id": container_ids}
+        return self._fast_get(
+            "/containers/json",
+            lambda: self.client.api.containers(all=True, filters=filters),
+            {"all": 1, "filters": json.dumps(filters)},
+        )
+
     def get_system_info(self) -> Dict:
         """Get system information"""
         try:
             if not self.client:
                 return {}
 
-            info = self.client.info()
+            info = self._info()
             return {
                 "containers": info.get("Containers", 0),
                 "containers_running": info.get("ContainersRunning", 0),
@@ -396,9 +831,23 @@ class DockerSwarmManager:
                 "memory": info.get("MemTotal", 0),
             }
         except Exception as e:
-            logger.error(f"Error getting system info: {e}")
+            logger.error("Error getting system info: %s", e)
             return {}
 
+    def get_dashboard_bundle(self) -> Dict:
+        """Get swarm state, system info, nodes and services in one pass"""
+        # One /info read answers the swarm and system getters; the two list
+        # endpoints are then fetched concurrently
+        swarm_active = self.is_swarm_active()
+        nodes, services = run_in_parallel(self.get_nodes, self.get_services)
+        return {
+            "swarm_active": swarm_active,
+            "swarm_info": self.get_swarm_info(),
+            "system_info": self.get_system_info(),
+            "nodes": nodes,
+            "services": services,
+        }
+
     def get_cluster_resources(self) -> Dict:
         """Get aggregated resources from all nodes in the cluster"""
         try:
@@ -429,21 +878,20 @@ class DockerSwarmManager:
 
             for node in nodes:
                 # Count node types
-                if node.get("role") == "manager":
+                if node.role == "manager":
                     manager_nodes += 1
                 else:
                     worker_nodes += 1
                       
                 # Count node status
-                if node.get("status") == "ready":
+                if node.status == "ready":
                     nodes_ready += 1
                 else:
                     nodes_down += 1
                       
                 # Aggregate resources
-                if "resources" in node:
-                    total_cpus += node["resources"].get("cpu", 0)
-                    total_memory_bytes += node["resources"].get("memory", 0) * (1024**3)  # Convert GB to bytes
+                total_cpus += node.resources.get("cpu", 0)
+                total_memory_bytes += node.resources.get("memory", 0) * (1024**3)  # Convert GB to bytes
 
             # Get container counts from system info
             system_info = self.get_system_info()
@@ -461,7 +909,7 @@ class DockerSwarmManager:
                 "cluster_utilization": self._calculate_cluster_utilization(),
             }
         except Exception as e:
-            logger.error(f"Error getting cluster resources: {e}")
+            logger.error("Error getting cluster resources: %s", e)
             return {}
 
     def get_cluster_stats(self) -> Dict:
@@ -477,8 +925,10 @@ class DockerSwarmManager:
             import psutil
             import time
               
-            # Get CPU usage (average over short period)
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage comes from the continuously running sampler instead
+            # of blocking this request for a one second window
+            cpu_percent = latest_cpu_percent()
+            services, nodes = run_in_parallel(self.get_services, self.get_nodes)
               
             # Get memory usage
             memory = psutil.virtual_memory()
@@ -514,11 +964,11 @@ class DockerSwarmManager:
                 "network_bytes_sent": network.bytes_sent,
                 "network_bytes_recv": network.bytes_recv,
                 "containers_running": system_info.get("containers_running", 0),
-                "services_count": len(self.get_services()),
-                "nodes_ready": len([n for n in self.get_nodes() if n.get("status") == "ready"]),
+                "services_count": len(services),
+                "nodes_ready": len([n for n in nodes if n.status == "ready"]),
             }
         except Exception as e:
-            logger.error(f"Error getting cluster stats: {e}")
+            logger.error("Error getting cluster stats: %s", e)
             return {}
 
     def _calculate_cluster_utilization(self) -> Dict:
@@ -526,8 +976,9 @@ class DockerSwarmManager:
         try:
             import psutil
               
-            # Get current system utilization
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            # Get current system utilization; CPU is a non-blocking read of
+            # the latest background sample
+            cpu_percent = latest_cpu_percent()
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
               
@@ -537,7 +988,7 @@ class DockerSwarmManager:
                 "disk_percent": round((disk.used / disk.total) * 100, 1),
             }
         except Exception as e:
-            logger.error(f"Error calculating cluster utilization: {e}")
+            logger.error("Error calculating cluster utilization: %s", e)
             return {
                 "cpu_percent": 0,
                 "memory_percent": 0,
@@ -557,3 +1008,57 @@ class DockerSwarmManager:
                 }
             )
         return ports
+
+
+_event_watcher_pid = None
+_event_watcher_lock = threading.Lock()
+
+
+def _invalidate_on_events(client):
+    """Drop the cached swarm lists whenever a service or node changes"""
+    global _event_watcher_pid
+    try:
+        for _event in client.api.events(filters={"type": ["service", "node"]}, decode=True):
+            invalidate_list_cache()
+    except Exception as e:
+        logger.warning("Docker event stream stopped: %s", e)
+    finally:
+        # The list TTL covers the gap until the next call restarts the watcher;
+        # back off first so a down daemon doesn't spawn a thread per request
+        time.sleep(EVENT_WATCHER_RETRY_DELAY)
+        _event_watcher_pid = None
+
+
+def _ensure_event_watcher(client):
+    """Start this process's Docker event watcher if it is not running"""
+    global _event_watcher_pid
+
+    # Forked workers need their own watcher thread
+    pid = os.getpid()
+    if _event_watcher_pid != pid:
+        with _event_watcher_lock:
+            if _event_watcher_pid != pid:
+                _event_watcher_pid = pid
+                threading.Thread(
+                    target=_invalidate_on_events,
+                    args=(client,),
+                    name="docker-event-watcher",
+                    daemon=True,
+                ).start()
+
+
+def get_docker_manager() -> DockerSwarmManager:
+    """Get the per-process DockerSwarmManager, reusing its pooled client"""
+    global _manager_singleton
+    manager = _manager_singleton
+    if manager is None or manager.client is not _get_client():
+        manager = DockerSwarmManager()
+        # Don't pin a manager without a client; retry connecting on the next call
+        if manager.client is None:
+            return manager
+        _manager_singleton = manager
+
+    # Changes made outside this process (CLI, other managers) then show up
+    # without waiting for the list TTL
+    _ensure_event_watcher(manager.client)
+    return manager
@@ -0,0 +1,52 @@
+"""
+JSON encoding and decoding helpers backed by orjson when available
+"""
+
+import dataclasses
+import json
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class JSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder that also serializes dataclasses"""
+
+    def default(self, o):
+        if dataclasses.is_dataclass(o) and not isinstance(o, type):
+            return dataclasses.asdict(o)
+        return super().default(o)
+
+
+_encoder = JSONEncoder()
+
+
+def loads(data) -> Any:
+    """Decode JSON from bytes or str"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data: Any) -> bytes:
+    """Encode data as JSON bytes, handling the same types as JsonResponse"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, cls=JSONEncoder).encode()
+
+
+class FastJsonResponse(HttpResponse):
+    """Drop-in replacement for JsonResponse that serializes with orjson"""
+
+    def __init__(self, data: Any, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
@@ -0,0 +1,56 @@
+"""
+Management command to fill the indexed tag columns on metrics stored before they existed
+"""
+import logging
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from dashboard.models import Metric
+
+logger = logging.getLogger(__name__)
+
+# Rows read and updated per batch
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Copy hot tags (resource, service/node id and name) into their indexed Metric columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Rows updated per batch (default: {BATCH_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        columns = sorted(set(Metric.TAG_COLUMNS.values()))
+
+        # Rows from before the columns existed have all of them unset
+        pending = Metric.objects.filter(
+            **{f'{column}__isnull': True for column in columns}
+        ).order_by('pk')
+
+        updated = 0
+        last_pk = 0
+        while True:
+            batch = list(pending.filter(pk__gt=last_pk).only('pk', 'tags', *columns)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            changed = []
+            for metric in batch:
+                values = Metric.tag_columns(metric.tags or {})
+                if values:
+                    for column, value in values.items():
+                        setattr(metric, column, value)
+                    changed.append(metric)
+
+            if changed:
+                with transaction.atomic():
+                    Metric.objects.bulk_update(changed, columns)
+                updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled tag columns on {updated} metrics'))
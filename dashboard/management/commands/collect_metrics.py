@@ -2,12 +2,44 @@
 Management command to collect and store Docker Swarm metrics
 """
 import logging
+import time
+from functools import partial
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from dashboard.concurrency_utils import run_in_parallel
 from dashboard.metrics import MetricsCollector
 
 logger = logging.getLogger(__name__)
 
+# Seconds between hourly rollup refreshes in continuous mode
+ROLLUP_REFRESH_INTERVAL = 300
+
+# Measurement -> (collector method, prefetched swarm data it reads)
+COLLECTORS = {
+    'system_resources': ('collect_system_resources', None),
+    'service_replicas': ('collect_service_replicas', 'services'),
+    'service_health': ('collect_service_health', 'services'),
+    'node_resources': ('collect_node_resources', 'nodes'),
+    'node_status': ('collect_node_status', 'nodes'),
+}
+
+
+def normalize_nodes(nodes_data):
+    """Flatten raw nodes to (id, hostname, nano_cpus, memory_bytes, state, availability) tuples"""
+    nodes = []
+    for node in nodes_data:
+        description = node.get('Description', {})
+        resources = description.get('Resources', {})
+        nodes.append((
+            node['ID'],
+            description.get('Hostname', 'unknown'),
+            resources.get('NanoCPUs', 0),
+            resources.get('MemoryBytes', 0),
+            node.get('Status', {}).get('State', 'unknown'),
+            node.get('Spec', {}).get('Availability', 'unknown'),
+        ))
+    return nodes
+
 
 class Command(BaseCommand):
     help = 'Collect and store Docker Swarm metrics'
@@ -27,7 +59,7 @@ class Command(BaseCommand):
         parser.add_argument(
             '--measurements',
             nargs='+',
-            default=['system_resources', 'service_replicas', 'service_health', 'node_resources', 'node_status'],
+            default=list(COLLECTORS),
             help='Measurements to collect (default: all)',
         )
 
@@ -41,13 +73,13 @@ class Command(BaseCommand):
             self.style.SUCCESS(f'Starting metrics collection for: {", ".join(measurements)}')
         )
 
+        if 'system_resources' in measurements:
+            self.prime_cpu_sampling()
+
         if continuous:
             self.stdout.write(f'Running continuously with {interval}s interval. Press Ctrl+C to stop.')
             try:
-                import time
-                while True:
-                    self.collect_all_metrics(collector, measurements)
-                    time.sleep(interval)
+                self.run_on_schedule(collector, measurements, interval)
             except KeyboardInterrupt:
                 self.stdout.write(self.style.WARNING('\nStopping metrics collection...'))
         else:
@@ -55,201 +87,266 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS('Metrics collection completed'))
 
+    def run_on_schedule(self, collector, measurements, interval):
+        """Collect on a fixed cadence against monotonic deadlines so cycles don't drift"""
+        next_deadline = time.monotonic()
+        # Fill the trend rollup for all retained history once, then keep its
+        # newest hours current alongside collection
+        self.refresh_rollup(collector, backfill=True)
+        next_rollup = next_deadline + ROLLUP_REFRESH_INTERVAL
+        while True:
+            # Keep swarm topology in memory from Docker events; (re)started
+            # here so a dropped event stream recovers on the next cycle
+            collector.start_event_watcher()
+            self.collect_all_metrics(collector, measurements)
+            next_deadline += interval
+
+            if time.monotonic() >= next_rollup:
+                self.refresh_rollup(collector)
+                next_rollup = time.monotonic() + ROLLUP_REFRESH_INTERVAL
+
+            now = time.monotonic()
+            if now >= next_deadline:
+                # Overran one or more slots: skip to the next future boundary
+                # instead of collecting back-to-back to catch up
+                missed = int((now - next_deadline) // interval) + 1
+                next_deadline += missed * interval
+                logger.warning(
+                    f'Metrics collection overran the {interval}s interval, '
+                    f'skipping {missed} cycle(s)'
+                )
+
+            time.sleep(next_deadline - now)
+
     def collect_all_metrics(self, collector, measurements):
         """Collect all specified measurements"""
         start_time = timezone.now()
-        self.stdout.write(f'[{start_time.strftime("%Y-%m-%d %H:%M:%S")}] Collecting metrics...')
+        # Buffer this cycle's report and write it in one go at the end
+        lines = [f'[{start_time.strftime("%Y-%m-%d %H:%M:%S")}] Collecting metrics...']
 
         metrics_collected = 0
+        warning, error_style = self.style.WARNING, self.style.ERROR
 
+        # Fetch services and nodes once; several collectors share them
+        needed = {COLLECTORS[m][1] for m in measurements if m in COLLECTORS}
+        services_data, nodes_data = run_in_parallel(
+            collector.get_service_replicas if 'services' in needed else list,
+            collector.get_nodes_data if 'nodes' in needed else list,
+        )
+        # Services arrive already flattened; resolve the nested node fields
+        # once for all collectors sharing them
+        prefetched = {
+            'services': services_data,
+            'nodes': normalize_nodes(nodes_data),
+        }
+
+        # Every point in this cycle shares the cycle's start timestamp
+        tasks = []
         for measurement in measurements:
-            try:
-                if measurement == 'system_resources':
-                    count = self.collect_system_resources(collector)
-                elif measurement == 'service_replicas':
-                    count = self.collect_service_replicas(collector)
-                elif measurement == 'service_health':
-                    count = self.collect_service_health(collector)
-                elif measurement == 'node_resources':
-                    count = self.collect_node_resources(collector)
-                elif measurement == 'node_status':
-                    count = self.collect_node_status(collector)
-                else:
-                    self.stdout.write(
-                        self.style.WARNING(f'Unknown measurement: {measurement}')
-                    )
-                    continue
-
-                metrics_collected += count
-                self.stdout.write(f'  ✓ {measurement}: {count} metrics')
-
-            except Exception as e:
-                logger.error(f'Error collecting {measurement}: {e}')
-                self.stdout.write(
-                    self.style.ERROR(f'  ✗ {measurement}: Error - {e}')
-                )
+            entry = COLLECTORS.get(measurement)
+            if entry is None:
+                lines.append(warning(f'Unknown measurement: {measurement}'))
+                continue
+
+            method_name, data_key = entry
+            args = (collector,) if data_key is None else (collector, prefetched[data_key])
+            tasks.append(
+                (measurement, partial(getattr(self, method_name), *args, timestamp=start_time))
+            )
+
+        # Run the collectors concurrently; output is written from this thread only
+        results = run_in_parallel(
+            *[partial(self._run_collector, measurement, task) for measurement, task in tasks]
+        )
+
+        for (measurement, _), (count, error) in zip(tasks, results):
+            if error is not None:
+                lines.append(error_style(f'  ✗ {measurement}: Error - {error}'))
+                continue
+
+            metrics_collected += count
+            lines.append(f'  ✓ {measurement}: {count} metrics')
 
         end_time = timezone.now()
         duration = (end_time - start_time).total_seconds()
-        self.stdout.write(
-            f'Collected {metrics_collected} total metrics in {duration:.2f}s'
-        )
+        lines.append(f'Collected {metrics_collected} total metrics in {duration:.2f}s')
 
-    def collect_system_resources(self, collector):
+        self.stdout.write('\n'.join(lines))
+        self.stdout.flush()
+
+    def refresh_rollup(self, collector, backfill=False):
+        """Recompute recent hourly rollup buckets, or all of them on backfill"""
+        try:
+            collector.refresh_hourly_rollup(backfill=backfill)
+        except Exception as e:
+            logger.error(f'Error refreshing hourly rollup: {e}')
+
+    def _run_collector(self, measurement, task):
+        """Run one collector and return its count and any error raised"""
+        try:
+            return task(), None
+        except Exception as e:
+            logger.error(f'Error collecting {measurement}: {e}')
+            return 0, e
+
+    def prime_cpu_sampling(self):
+        """Start psutil's CPU counter so later samples need not block"""
+        try:
+            import psutil
+            psutil.cpu_percent(interval=None)
+        except ImportError:
+            pass
+
+    def collect_system_resources(self, collector, timestamp=None):
         """Collect system resource metrics"""
         try:
             # Get system stats using psutil
             import psutil
             
-            timestamp = timezone.now()
-            metrics_count = 0
+            timestamp = timestamp or timezone.now()
+            rows = []
 
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            collector.store_metric('system_resources', {'resource': 'cpu'}, {'usage': cpu_percent}, timestamp)
-            metrics_count += 1
+            # CPU usage since the previous call (the priming call or the last
+            # cycle), so no sleep is needed; a sample taken straight after
+            # priming covers a very short window and is less meaningful
+            cpu_percent = psutil.cpu_percent(interval=None)
+            rows.append(('system_resources', {'resource': 'cpu'}, {'usage': cpu_percent}, timestamp))
 
             # Memory usage
             memory = psutil.virtual_memory()
-            collector.store_metric('system_resources', {'resource': 'memory'}, {
+            rows.append(('system_resources', {'resource': 'memory'}, {
                 'usage_bytes': memory.used,
                 'total_bytes': memory.total,
                 'usage_percent': memory.percent
-            }, timestamp)
-            metrics_count += 1
+            }, timestamp))
 
             # Disk usage
             disk = psutil.disk_usage('/')
-            collector.store_metric('system_resources', {'resource': 'disk'}, {
+            rows.append(('system_resources', {'resource': 'disk'}, {
                 'usage_bytes': disk.used,
                 'total_bytes': disk.total,
                 'usage_percent': (disk.used / disk.total) * 100
-            }, timestamp)
-            metrics_count += 1
+            }, timestamp))
 
             # Network I/O
             network = psutil.net_io_counters()
-            collector.store_metric('system_resources', {'resource': 'network'}, {
+            rows.append(('system_resources', {'resource': 'network'}, {
                 'bytes_sent': network.bytes_sent,
                 'bytes_recv': network.bytes_recv,
                 'packets_sent': network.packets_sent,
                 'packets_recv': network.packets_recv
-            }, timestamp)
-            metrics_count += 1
+            }, timestamp))
 
-            return metrics_count
+            collector.store_metrics_bulk(rows)
+            return len(rows)
 
         except Exception as e:
             logger.error(f'Error collecting system resources: {e}')
             return 0
 
-    def collect_service_replicas(self, collector):
+    def collect_service_replicas(self, collector, services=None, timestamp=None):
         """Collect service replica metrics"""
         try:
-            services_data = collector.get_services_data()
-            timestamp = timezone.now()
-            metrics_count = 0
-
-            for service in services_data:
-                collector.store_metric('service_replicas', {
-                    'service_id': service['ID'],
-                    'service_name': service['Spec']['Name']
+            if services is None:
+                services = collector.get_service_replicas()
+            timestamp = timestamp or timezone.now()
+            rows = []
+
+            for service in services:
+                rows.append(('service_replicas', {
+                    'service_id': service['id'],
+                    'service_name': service['name']
                 }, {
-                    'replicas_running': service.get('replicas_running', 0),
-                    'replicas_desired': service.get('replicas_desired', 0)
-                }, timestamp)
-                metrics_count += 1
+                    'replicas_running': service['running'],
+                    'replicas_desired': service['desired']
+                }, timestamp))
 
-            return metrics_count
+            collector.store_metrics_bulk(rows)
+            return len(rows)
 
         except Exception as e:
             logger.error(f'Error collecting service replicas: {e}')
             return 0
 
-    def collect_service_health(self, collector):
+    def collect_service_health(self, collector, services=None, timestamp=None):
         """Collect service health metrics"""
         try:
-            services_data = collector.get_services_data()
-            timestamp = timezone.now()
-            metrics_count = 0
+            if services is None:
+                services = collector.get_service_replicas()
+            timestamp = timestamp or timezone.now()
+            rows = []
 
-            for service in services_data:
+            for service in services:
+                running, desired = service['running'], service['desired']
                 # Simple health check based on replicas
-                replicas_running = service.get('replicas_running', 0)
-                replicas_desired = service.get('replicas_desired', 0)
-                
-                health_score = (replicas_running / replicas_desired) if replicas_desired > 0 else 0
-                is_healthy = replicas_running == replicas_desired and replicas_desired > 0
-
-                collector.store_metric('service_health', {
-                    'service_id': service['ID'],
-                    'service_name': service['Spec']['Name']
+                health_score = (running / desired) if desired > 0 else 0
+                is_healthy = running == desired and desired > 0
+
+                rows.append(('service_health', {
+                    'service_id': service['id'],
+                    'service_name': service['name']
                 }, {
                     'health_score': health_score,
                     'is_healthy': 1 if is_healthy else 0,
                     'replicas_ratio': health_score
-                }, timestamp)
-                metrics_count += 1
+                }, timestamp))
 
-            return metrics_count
+            collector.store_metrics_bulk(rows)
+            return len(rows)
 
         except Exception as e:
             logger.error(f'Error collecting service health: {e}')
             return 0
 
-    def collect_node_resources(self, collector):
+    def collect_node_resources(self, collector, nodes=None, timestamp=None):
         """Collect node resource metrics"""
         try:
-            nodes_data = collector.get_nodes_data()
-            timestamp = timezone.now()
-            metrics_count = 0
-
-            for node in nodes_data:
-                # Get resource information from node
-                resources = node.get('Description', {}).get('Resources', {})
-                
-                collector.store_metric('node_resources', {
-                    'node_id': node['ID'],
-                    'node_hostname': node.get('Description', {}).get('Hostname', 'unknown')
+            if nodes is None:
+                nodes = normalize_nodes(collector.get_nodes_data())
+            timestamp = timestamp or timezone.now()
+            rows = []
+
+            for node_id, hostname, nano_cpus, memory_bytes, _, _ in nodes:
+                rows.append(('node_resources', {
+                    'node_id': node_id,
+                    'node_hostname': hostname
                 }, {
-                    'cpu_cores': resources.get('NanoCPUs', 0) / 1000000000,  # Convert from nanocores
-                    'memory_bytes': resources.get('MemoryBytes', 0)
-                }, timestamp)
-                metrics_count += 1
+                    'cpu_cores': nano_cpus / 1000000000,  # Convert from nanocores
+                    'memory_bytes': memory_bytes
+                }, timestamp))
 
-            return metrics_count
+            collector.store_metrics_bulk(rows)
+            return len(rows)
 
         except Exception as e:
             logger.error(f'Error collecting node resources: {e}')
             return 0
 
-    def collect_node_status(self, collector):
+    def collect_node_status(self, collector, nodes=None, timestamp=None):
         """Collect node status metrics"""
         try:
-            nodes_data = collector.get_nodes_data()
-            timestamp = timezone.now()
-            metrics_count = 0
-
-            for node in nodes_data:
-                status = node.get('Status', {})
-                availability = node.get('Spec', {}).get('Availability', 'unknown')
-                
+            if nodes is None:
+                nodes = normalize_nodes(collector.get_nodes_data())
+            timestamp = timestamp or timezone.now()
+            rows = []
+
+            for node_id, hostname, _, _, state, availability in nodes:
                 is_available = availability == 'active'
-                is_ready = status.get('State') == 'ready'
+                is_ready = state == 'ready'
 
-                collector.store_metric('node_status', {
-                    'node_id': node['ID'],
-                    'node_hostname': node.get('Description', {}).get('Hostname', 'unknown')
+                rows.append(('node_status', {
+                    'node_id': node_id,
+                    'node_hostname': hostname
                 }, {
                     'is_available': 1 if is_available else 0,
                     'is_ready': 1 if is_ready else 0,
                     'availability': availability,
-                    'state': status.get('State', 'unknown')
-                }, timestamp)
-                metrics_count += 1
+                    'state': state
+                }, timestamp))
 
-            return metrics_count
+            collector.store_metrics_bulk(rows)
+            return len(rows)
 
         except Exception as e:
             logger.error(f'Error collecting node status: {e}')
-            return 0
\ No newline at end of file
+            return 0
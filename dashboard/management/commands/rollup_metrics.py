@@ -0,0 +1,65 @@
+"""
+Management command to refresh the hourly metrics rollup
+"""
+import logging
+from django.core.management.base import BaseCommand
+from dashboard.metrics import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Refresh the hourly metrics rollup used by trend analytics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--continuous',
+            action='store_true',
+            help='Run continuously refreshing the rollup every 5 minutes',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=300,
+            help='Refresh interval in seconds (default: 300)',
+        )
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=2,
+            help='Number of recent hours to recompute (default: 2)',
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Recompute every hour that still has raw metrics before refreshing',
+        )
+
+    def handle(self, *args, **options):
+        collector = MetricsCollector()
+        interval = options['interval']
+        hours = options['hours']
+
+        if options['backfill']:
+            self.refresh(collector, hours, backfill=True)
+
+        if options['continuous']:
+            self.stdout.write(f'Refreshing rollup every {interval}s. Press Ctrl+C to stop.')
+            try:
+                import time
+                while True:
+                    self.refresh(collector, hours)
+                    time.sleep(interval)
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.WARNING('\nStopping rollup refresh...'))
+        else:
+            self.refresh(collector, hours)
+
+    def refresh(self, collector, hours, backfill=False):
+        """Recompute the rollup buckets for the last N hours, or all of them"""
+        try:
+            count = collector.refresh_hourly_rollup(hours, backfill=backfill)
+            self.stdout.write(self.style.SUCCESS(f'Refreshed {count} rollup buckets'))
+        except Exception as e:
+            logger.error(f'Error refreshing hourly rollup: {e}')
+            self.stdout.write(self.style.ERROR(f'Error refreshing rollup: {e}'))
@@ -3,13 +3,46 @@ Management command to set up sample metrics data for testing
 """
 import logging
 import random
+from itertools import islice
 from datetime import datetime, timedelta
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
 from django.utils import timezone
 from dashboard.models import Metric
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT when flushing generated metrics
+BATCH_SIZE = 1000
+
+# Sample swarm topology
+SERVICE_NAMES = ['web-app', 'database', 'cache', 'api-server', 'worker']
+NODE_NAMES = ['manager-1', 'worker-1', 'worker-2']
+
+# Base values for realistic data
+BASE_CPU = 30.0
+BASE_MEMORY = 60.0
+BASE_DISK = 45.0
+BASE_NETWORK_SENT = 1000000
+BASE_NETWORK_RECV = 2000000
+
+MEMORY_TOTAL_BYTES = 8589934592  # 8GB
+DISK_TOTAL_BYTES = 107374182400  # 100GB
+
+# Tags shared by every generated system resource row; Django serializes
+# them on save, so one dict per resource is enough
+CPU_TAGS = {'resource': 'cpu'}
+MEMORY_TAGS = {'resource': 'memory'}
+DISK_TAGS = {'resource': 'disk'}
+NETWORK_TAGS = {'resource': 'network'}
+
+
+def _clamped_series(rng, count, base, low, high):
+    """Draw ``count`` values of base + uniform(low, high), clamped to 0-100"""
+    uniform = rng.uniform
+    return [max(0, min(100, base + uniform(low, high))) for _ in range(count)]
+
 
 class Command(BaseCommand):
     help = 'Generate sample metrics data for testing the analytics dashboard'
@@ -27,11 +60,19 @@ class Command(BaseCommand):
             default=300,  # 5 minutes
             help='Interval between data points in seconds (default: 300)',
         )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Random seed for reproducible sample data',
+        )
 
     def handle(self, *args, **options):
         days = options['days']
         interval = options['interval']
-        
+        # Dedicated generator instead of the shared module-level one
+        rng = random.Random(options['seed'])
+
         self.stdout.write(
             self.style.SUCCESS(f'Generating {days} days of sample metrics data...')
         )
@@ -43,67 +84,106 @@ class Command(BaseCommand):
         # Generate time series data
         end_time = timezone.now()
         start_time = end_time - timedelta(days=days)
-        current_time = start_time
-        
+        step = timedelta(seconds=interval)
+        cycles = int((end_time - start_time) / step) + 1
+
+        # Stream rows into multi-row INSERTs inside one transaction, holding
+        # at most one batch of instances in memory
+        metrics = self._generate_metrics(rng, start_time, step, cycles)
         metrics_created = 0
-        
-        # Base values for realistic data
-        base_cpu = 30.0
-        base_memory = 60.0
-        base_disk = 45.0
-        base_network_sent = 1000000
-        base_network_recv = 2000000
-        
-        while current_time <= end_time:
-            # Generate system resource metrics with realistic variations
-            cpu_usage = base_cpu + random.uniform(-15, 25)
-            cpu_usage = max(0, min(100, cpu_usage))  # Clamp between 0-100
-            
-            memory_usage = base_memory + random.uniform(-20, 30)
-            memory_usage = max(0, min(100, memory_usage))
-            
-            disk_usage = base_disk + random.uniform(-10, 15)
-            disk_usage = max(0, min(100, disk_usage))
-            
-            network_sent = base_network_sent + random.uniform(-500000, 1500000)
-            network_recv = base_network_recv + random.uniform(-800000, 2000000)
-            
+        with transaction.atomic():
+            while batch := list(islice(metrics, BATCH_SIZE)):
+                Metric.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+                metrics_created += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Generated {metrics_created} sample metrics over {days} days '
+                f'with {interval}s intervals'
+            )
+        )
+
+        # Show some statistics, all derived from a single GROUP BY query
+        breakdown = list(
+            Metric.objects.values('measurement').annotate(count=Count('id')).order_by('measurement')
+        )
+        total_metrics = sum(row['count'] for row in breakdown)
+
+        self.stdout.write(f'Total metrics in database: {total_metrics}')
+        self.stdout.write(f'Different measurements: {len(breakdown)}')
+
+        # Show measurement breakdown
+        for row in breakdown:
+            self.stdout.write(f"  {row['measurement']}: {row['count']} metrics")
+
+        self.stdout.write(
+            self.style.SUCCESS('Sample data generation completed!')
+        )
+
+    def _generate_metrics(self, rng, start_time, step, cycles):
+        """Yield unsaved sample Metric rows cycle by cycle"""
+        # Tags and constant fields are identical for every cycle
+        service_tags = [
+            {'service_id': f"service_{i+1}", 'service_name': service_name}
+            for i, service_name in enumerate(SERVICE_NAMES)
+        ]
+        node_tags = [
+            {'node_id': f"node_{i+1}", 'node_hostname': node_name}
+            for i, node_name in enumerate(NODE_NAMES)
+        ]
+        node_resource_fields = {'cpu_cores': 4.0, 'memory_bytes': MEMORY_TOTAL_BYTES}
+
+        # Compute every cycle's timestamp by index and draw each system
+        # resource series for all cycles up front
+        timestamps = [start_time + i * step for i in range(cycles)]
+        uniform = rng.uniform
+        cpu_series = _clamped_series(rng, cycles, BASE_CPU, -15, 25)
+        memory_series = _clamped_series(rng, cycles, BASE_MEMORY, -20, 30)
+        disk_series = _clamped_series(rng, cycles, BASE_DISK, -10, 15)
+        sent_series = [BASE_NETWORK_SENT + uniform(-500000, 1500000) for _ in range(cycles)]
+        recv_series = [BASE_NETWORK_RECV + uniform(-800000, 2000000) for _ in range(cycles)]
+
+        choice, rand, randint = rng.choice, rng.random, rng.randint
+
+        for current_time, cpu_usage, memory_usage, disk_usage, network_sent, network_recv in zip(
+            timestamps, cpu_series, memory_series, disk_series, sent_series, recv_series
+        ):
             # CPU metric
-            Metric.objects.create(
+            yield Metric.from_point(
                 measurement='system_resources',
-                tags={'resource': 'cpu'},
+                tags=CPU_TAGS,
                 fields={'usage': cpu_usage},
                 timestamp=current_time
             )
-            
+
             # Memory metric
-            Metric.objects.create(
+            yield Metric.from_point(
                 measurement='system_resources',
-                tags={'resource': 'memory'},
+                tags=MEMORY_TAGS,
                 fields={
                     'usage_percent': memory_usage,
-                    'usage_bytes': int(memory_usage * 8589934592 / 100),  # 8GB total
-                    'total_bytes': 8589934592
+                    'usage_bytes': int(memory_usage * MEMORY_TOTAL_BYTES / 100),
+                    'total_bytes': MEMORY_TOTAL_BYTES
                 },
                 timestamp=current_time
             )
-            
+
             # Disk metric
-            Metric.objects.create(
+            yield Metric.from_point(
                 measurement='system_resources',
-                tags={'resource': 'disk'},
+                tags=DISK_TAGS,
                 fields={
                     'usage_percent': disk_usage,
-                    'usage_bytes': int(disk_usage * 107374182400 / 100),  # 100GB total
-                    'total_bytes': 107374182400
+                    'usage_bytes': int(disk_usage * DISK_TOTAL_BYTES / 100),
+                    'total_bytes': DISK_TOTAL_BYTES
                 },
                 timestamp=current_time
             )
-            
+
             # Network metric
-            Metric.objects.create(
+            yield Metric.from_point(
                 measurement='system_resources',
-                tags={'resource': 'network'},
+                tags=NETWORK_TAGS,
                 fields={
                     'bytes_sent': int(network_sent),
                     'bytes_recv': int(network_recv),
@@ -112,41 +192,33 @@ class Command(BaseCommand):
                 },
                 timestamp=current_time
             )
-            
+
             # Generate service replica metrics (sample services)
-            service_names = ['web-app', 'database', 'cache', 'api-server', 'worker']
-            for i, service_name in enumerate(service_names):
-                service_id = f"service_{i+1}"
-                desired_replicas = random.choice([2, 3, 4, 5])
+            for tags in service_tags:
+                desired_replicas = choice([2, 3, 4, 5])
                 running_replicas = desired_replicas
-                
+
                 # Occasionally simulate service issues
-                if random.random() < 0.05:  # 5% chance of issues
-                    running_replicas = max(0, desired_replicas - random.randint(1, 2))
-                
-                Metric.objects.create(
+                if rand() < 0.05:  # 5% chance of issues
+                    running_replicas = max(0, desired_replicas - randint(1, 2))
+
+                yield Metric.from_point(
                     measurement='service_replicas',
-                    tags={
-                        'service_id': service_id,
-                        'service_name': service_name
-                    },
+                    tags=tags,
                     fields={
                         'replicas_running': running_replicas,
                         'replicas_desired': desired_replicas
                     },
                     timestamp=current_time
                 )
-                
+
                 # Service health metrics
                 health_score = running_replicas / desired_replicas if desired_replicas > 0 else 0
                 is_healthy = running_replicas == desired_replicas
-                
-                Metric.objects.create(
+
+                yield Metric.from_point(
                     measurement='service_health',
-                    tags={
-                        'service_id': service_id,
-                        'service_name': service_name
-                    },
+                    tags=tags,
                     fields={
                         'health_score': health_score,
                         'is_healthy': 1 if is_healthy else 0,
@@ -154,35 +226,23 @@ class Command(BaseCommand):
                     },
                     timestamp=current_time
                 )
-            
+
             # Generate node resource metrics (sample nodes)
-            node_names = ['manager-1', 'worker-1', 'worker-2']
-            for i, node_name in enumerate(node_names):
-                node_id = f"node_{i+1}"
-                
-                Metric.objects.create(
+            for tags in node_tags:
+                yield Metric.from_point(
                     measurement='node_resources',
-                    tags={
-                        'node_id': node_id,
-                        'node_hostname': node_name
-                    },
-                    fields={
-                        'cpu_cores': 4.0,
-                        'memory_bytes': 8589934592  # 8GB
-                    },
+                    tags=tags,
+                    fields=node_resource_fields,
                     timestamp=current_time
                 )
-                
+
                 # Node status metrics
-                is_available = random.random() > 0.02  # 98% uptime
-                is_ready = is_available and random.random() > 0.01  # 99% ready when available
-                
-                Metric.objects.create(
+                is_available = rand() > 0.02  # 98% uptime
+                is_ready = is_available and rand() > 0.01  # 99% ready when available
+
+                yield Metric.from_point(
                     measurement='node_status',
-                    tags={
-                        'node_id': node_id,
-                        'node_hostname': node_name
-                    },
+                    tags=tags,
                     fields={
                         'is_available': 1 if is_available else 0,
                         'is_ready': 1 if is_ready else 0,
@@ -191,29 +251,3 @@ class Command(BaseCommand):
                     },
                     timestamp=current_time
                 )
-            
-            metrics_created += 4 + (len(service_names) * 2) + (len(node_names) * 2)  # Count all metrics
-            current_time += timedelta(seconds=interval)
-        
-        self.stdout.write(
-            self.style.SUCCESS(
-                f'Generated {metrics_created} sample metrics over {days} days '
-                f'with {interval}s intervals'
-            )
-        )
-        
-        # Show some statistics
-        total_metrics = Metric.objects.count()
-        measurements = Metric.objects.values('measurement').distinct().count()
-        
-        self.stdout.write(f'Total metrics in database: {total_metrics}')
-        self.stdout.write(f'Different measurements: {measurements}')
-        
-        # Show measurement breakdown
-        for measurement in Metric.objects.values_list('measurement', flat=True).distinct():
-            count = Metric.objects.filter(measurement=measurement).count()
-            self.stdout.write(f'  {measurement}: {count} metrics')
-        
-        self.stdout.write(
-            self.style.SUCCESS('Sample data generation completed!')
-        )
\ No newline at end of file
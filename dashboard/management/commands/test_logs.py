@@ -2,7 +2,7 @@
 Django management command to test Docker logging functionality
 """
 
-from dashboard.docker_utils import DockerSwarmManager
+from dashboard.docker_utils import get_docker_manager
 from django.core.management.base import BaseCommand
 
 
@@ -14,7 +14,7 @@ class Command(BaseCommand):
         parser.add_argument("--container", type=str, help="Container ID to test")
 
     def handle(self, *args, **options):
-        docker_manager = DockerSwarmManager()
+        docker_manager = get_docker_manager()
 
         if options.get("service"):
             service_name = options["service"]
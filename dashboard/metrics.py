@@ -1,19 +1,62 @@
 """
 Metrics collection and storage for Docker Swarm monitoring
 """
+import atexit
+import json
 import time
 import logging
+import queue
+import threading
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Dict, List, Optional
+from django.db import transaction
+from django.db.models import Max, Min
 from django.utils import timezone
 from django.conf import settings
-from .docker_utils import DockerSwarmManager
+from .cache_utils import cached_with_fallback
+from .concurrency_utils import map_in_parallel, run_in_parallel
+from .docker_utils import get_docker_manager
 
 logger = logging.getLogger(__name__)
 
+# Raw swarm topology is shared between collectors and processes for a few seconds
+SWARM_DATA_CACHE_TTL = 5
+
+# Flux aggregation applied to historical InfluxDB queries
+INFLUXDB_HISTORY_AGGREGATION = '|> aggregateWindow(every: 5m, fn: mean, createEmpty: false)'
+
+# Cached metric chunks are refetched in full after this many seconds
+AGGREGATE_CACHE_TTL = 600
+
+# Trailing span re-read when extending a cached chunk; covers points committed
+# after their timestamp (at least one collection interval)
+AGGREGATE_CACHE_REFETCH_MARGIN = timedelta(minutes=2)
+
+# Unchanged service health and node status points are re-sent at this interval
+STATUS_HEARTBEAT = timedelta(minutes=5)
+
+# Dashboard time range suffixes and the timedelta argument they map to
+TIME_RANGE_UNITS = {'h': 'hours', 'd': 'days'}
+
+# Old database metrics are purged one time window per DELETE statement
+METRIC_CLEANUP_WINDOW = timedelta(days=1)
+
+# Background batching for InfluxDB writes (intervals in milliseconds)
+INFLUXDB_WRITE_OPTIONS = dict(
+    batch_size=5000,
+    flush_interval=10_000,
+    jitter_interval=1_000,
+    retry_interval=5_000,
+    max_retries=3,
+    max_retry_delay=30_000,
+    exponential_base=2,
+)
+
 try:
-    from influxdb_client import InfluxDBClient, Point, WritePrecision
-    from influxdb_client.client.write_api import SYNCHRONOUS
+    from influxdb_client import InfluxDBClient, WritePrecision
+    from influxdb_client.client.write_api import WriteOptions
     INFLUXDB_AVAILABLE = True
 except ImportError:
     INFLUXDB_AVAILABLE = False
@@ -25,12 +68,149 @@ except ImportError:
     PROMETHEUS_AVAILABLE = False
 
 
+# Line protocol escape tables, built once: measurement names, tag keys/values
+# and field keys, then string field values
+_MEASUREMENT_ESCAPES = str.maketrans({',': r'\,', ' ': r'\ ', '\n': r'\n'})
+_KEY_ESCAPES = str.maketrans({',': r'\,', '=': r'\=', ' ': r'\ ', '\n': r'\n'})
+_STRING_FIELD_ESCAPES = str.maketrans({'"': r'\"', '\\': '\\\\'})
+
+
+def _line_protocol_value(value) -> str:
+    """Format a field value the way InfluxDB line protocol types it"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return f'{value}i'
+    if isinstance(value, float):
+        return repr(value)
+    return f'"{str(value).translate(_STRING_FIELD_ESCAPES)}"'
+
+
+def to_line_protocol(measurement: str, tags: Dict, fields: Dict, timestamp: datetime) -> Optional[str]:
+    """Serialize one point to a line protocol string with second precision"""
+    field_set = ','.join(
+        f'{str(key).translate(_KEY_ESCAPES)}={_line_protocol_value(value)}'
+        for key, value in fields.items() if value is not None
+    )
+    if not field_set:
+        return None
+
+    tag_set = ''.join(
+        f',{str(key).translate(_KEY_ESCAPES)}={str(value).translate(_KEY_ESCAPES)}'
+        for key, value in tags.items() if value not in (None, '')
+    )
+    return f'{measurement.translate(_MEASUREMENT_ESCAPES)}{tag_set} {field_set} {int(timestamp.timestamp())}'
+
+
+def tag_label(tags: Dict) -> str:
+    """Label a tag combination the way dashboard bar charts display it"""
+    return '_'.join([f"{k}:{v}" for k, v in tags.items()])
+
+
+class AggregateCache:
+    """LRU cache of metric series chunks covering a known time window"""
+
+    def __init__(self, max_points: int = 200000):
+        self.max_points = max_points
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_range(self, fetch, measurement: str, tags: Dict, start_time: datetime,
+                  end_time: datetime, resolution: int = 0) -> List[Dict]:
+        """Serve a time range from cached chunks, fetching only the missing delta"""
+        try:
+            # Each window length slides independently, so a 1h and a 24h poll
+            # of the same series don't keep trimming each other's chunk
+            span = int((end_time - start_time).total_seconds())
+            key = (measurement, frozenset((tags or {}).items()), resolution, span)
+        except TypeError:
+            # Unhashable tag values can't be used as a cache key
+            return fetch(measurement, tags, start_time, end_time)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        now = time.monotonic()
+        if (
+            entry is None
+            or now - entry['fetched_at'] > AGGREGATE_CACHE_TTL
+            or start_time > entry['end']
+            or end_time < entry['start']
+        ):
+            entry = {
+                'start': start_time,
+                'end': end_time,
+                'fetched_at': now,
+                'points': fetch(measurement, tags, start_time, end_time)
+            }
+        else:
+            points = entry['points']
+            if start_time < entry['start']:
+                head = fetch(measurement, tags, start_time, entry['start'])
+                points = [p for p in head if p['timestamp'] < entry['start']] + points
+            if end_time > entry['end']:
+                # Points are stamped with their collection cycle's start but
+                # committed later, and the last downsampled window may still be
+                # partial; re-read a trailing margin instead of cutting at 'end'
+                margin = max(AGGREGATE_CACHE_REFETCH_MARGIN, timedelta(seconds=resolution))
+                refetch_from = max(entry['end'] - margin, min(start_time, entry['start']))
+                tail = fetch(measurement, tags, refetch_from, end_time)
+                points = [p for p in points if p['timestamp'] < refetch_from] + tail
+            entry = {
+                # Keep only the requested window so a sliding poll stays bounded
+                'start': start_time,
+                'end': max(end_time, entry['end']),
+                'fetched_at': entry['fetched_at'],
+                'points': [p for p in points if p['timestamp'] >= start_time]
+            }
+
+        self._store(key, entry)
+
+        return [p for p in entry['points'] if p['timestamp'] <= end_time]
+
+    def _store(self, key, entry):
+        """Store an entry and evict least recently used chunks over budget"""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous['points'])
+
+            self._entries[key] = entry
+            self._size += len(entry['points'])
+
+            while self._size > self.max_points and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted['points'])
+
+    def clear(self):
+        """Drop all cached chunks"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+aggregate_cache = AggregateCache()
+
+
 class MetricsCollector:
     """Collect and store Docker Swarm metrics"""
     
     def __init__(self, storage_backend='database'):
-        self.docker_manager = DockerSwarmManager()
+        self.docker_manager = get_docker_manager()
         self.storage_backend = storage_backend
+
+        # Swarm topology kept current by the event watcher, keyed by ID
+        self._services = None
+        self._nodes = None
+        self._watcher = None
+        self._topology_lock = threading.Lock()
+
+        # Last emitted status per service/node: id -> (value, timestamp)
+        self._last_health = {}
+        self._last_node_status = {}
         
         if storage_backend == 'influxdb' and INFLUXDB_AVAILABLE:
             self._init_influxdb()
@@ -48,13 +228,21 @@ class MetricsCollector:
             self.influxdb_client = InfluxDBClient(
                 url=influxdb_url,
                 token=influxdb_token,
-                org=influxdb_org
+                org=influxdb_org,
+                enable_gzip=True
             )
             self.influxdb_bucket = influxdb_bucket
             self.influxdb_org = influxdb_org
             
             # Test connection
             self.influxdb_client.ping()
+
+            # One batching writer for the collector's lifetime; closing it
+            # at exit flushes anything still queued
+            self._write_api = self.influxdb_client.write_api(
+                write_options=WriteOptions(**INFLUXDB_WRITE_OPTIONS)
+            )
+            atexit.register(self._write_api.close)
             logger.info("InfluxDB client initialized successfully")
             
         except Exception as e:
@@ -65,6 +253,9 @@ class MetricsCollector:
         """Initialize Prometheus metrics"""
         try:
             self.prometheus_registry = CollectorRegistry()
+
+            # Resolved label children keyed by (gauge, label values)
+            self._prom_children = {}
             
             # Define metrics
             self.prom_service_replicas = Gauge(
@@ -101,6 +292,22 @@ class MetricsCollector:
                 ['state'],
                 registry=self.prometheus_registry
             )
+
+            # Measurement -> gauge updater; other measurements are not exported
+            self._prom_handlers = {
+                'service_replicas': self._prom_set_service_replicas,
+                'node_resources': self._prom_set_node_resources,
+                'system_containers': self._prom_set_system_containers,
+            }
+
+            # Pushes run on a background worker so a slow gateway never
+            # blocks collection; at most one push is pending at a time
+            self._prom_gateway = getattr(settings, 'PROMETHEUS_PUSHGATEWAY_URL', None)
+            if self._prom_gateway:
+                self._push_queue = queue.Queue(maxsize=1)
+                threading.Thread(
+                    target=self._push_worker, name='prometheus-push', daemon=True
+                ).start()
             
             logger.info("Prometheus metrics initialized successfully")
             
@@ -113,28 +320,32 @@ class MetricsCollector:
         timestamp = timezone.now()
         
         try:
-            # Collect system metrics
-            system_metrics = self._collect_system_metrics(timestamp)
-            
-            # Collect service metrics
-            service_metrics = self._collect_service_metrics(timestamp)
-            
-            # Collect node metrics
-            node_metrics = self._collect_node_metrics(timestamp)
+            # System, service and node metrics each wait on separate Docker
+            # API calls, so fetch them concurrently
+            system_metrics, service_metrics, node_metrics = run_in_parallel(
+                partial(self._collect_system_metrics, timestamp),
+                partial(self._collect_service_metrics, timestamp),
+                partial(self._collect_node_metrics, timestamp),
+            )
             
+            # The collectors return fresh lists, so grow one in place rather
+            # than concatenating copies
+            rows = system_metrics
+            rows.extend(service_metrics)
+            rows.extend(node_metrics)
+            total = len(rows)
+
             # Store metrics based on backend
-            if self.storage_backend == 'influxdb':
-                self._store_to_influxdb(system_metrics + service_metrics + node_metrics)
-            elif self.storage_backend == 'prometheus':
-                self._store_to_prometheus(system_metrics, service_metrics, node_metrics)
+            if self.storage_backend == 'prometheus':
+                self._store_to_prometheus(rows)
             else:
-                self._store_to_database(system_metrics + service_metrics + node_metrics)
+                self.store_metrics_bulk(rows)
             
-            logger.info(f"Collected and stored metrics: {len(system_metrics + service_metrics + node_metrics)} points")
+            logger.info(f"Collected and stored metrics: {total} points")
             
             return {
                 'success': True,
-                'metrics_collected': len(system_metrics + service_metrics + node_metrics),
+                'metrics_collected': total,
                 'timestamp': timestamp
             }
             
@@ -147,294 +358,388 @@ class MetricsCollector:
             }
     
     def _collect_system_metrics(self, timestamp):
-        """Collect system-wide metrics"""
-        metrics = []
+        """Collect system-wide metrics as (measurement, tags, fields, timestamp) rows"""
+        rows = []
         
         try:
             system_info = self.docker_manager.get_system_info()
             swarm_info = self.docker_manager.get_swarm_info()
             
             # System container metrics
-            metrics.extend([
-                {
-                    'measurement': 'system_containers',
-                    'tags': {'state': 'total'},
-                    'fields': {'value': system_info.get('containers', 0)},
-                    'timestamp': timestamp
-                },
-                {
-                    'measurement': 'system_containers',
-                    'tags': {'state': 'running'},
-                    'fields': {'value': system_info.get('containers_running', 0)},
-                    'timestamp': timestamp
-                },
-                {
-                    'measurement': 'system_containers',
-                    'tags': {'state': 'stopped'},
-                    'fields': {'value': system_info.get('containers_stopped', 0)},
-                    'timestamp': timestamp
-                },
-                {
-                    'measurement': 'system_containers',
-                    'tags': {'state': 'paused'},
-                    'fields': {'value': system_info.get('containers_paused', 0)},
-                    'timestamp': timestamp
-                }
-            ])
+            for state, key in (
+                ('total', 'containers'),
+                ('running', 'containers_running'),
+                ('stopped', 'containers_stopped'),
+                ('paused', 'containers_paused'),
+            ):
+                rows.append(('system_containers', {'state': state},
+                             {'value': system_info.get(key, 0)}, timestamp))
             
             # System resource metrics
             if system_info.get('cpus'):
-                metrics.append({
-                    'measurement': 'system_resources',
-                    'tags': {'resource': 'cpu'},
-                    'fields': {'cores': system_info['cpus']},
-                    'timestamp': timestamp
-                })
+                rows.append(('system_resources', {'resource': 'cpu'},
+                             {'cores': system_info['cpus']}, timestamp))
             
             if system_info.get('memory'):
-                metrics.append({
-                    'measurement': 'system_resources',
-                    'tags': {'resource': 'memory'},
-                    'fields': {'bytes': system_info['memory']},
-                    'timestamp': timestamp
-                })
+                rows.append(('system_resources', {'resource': 'memory'},
+                             {'bytes': system_info['memory']}, timestamp))
             
             # Swarm metrics
             if swarm_info:
-                metrics.extend([
-                    {
-                        'measurement': 'swarm_info',
-                        'tags': {'metric': 'nodes'},
-                        'fields': {'value': swarm_info.get('nodes', 0)},
-                        'timestamp': timestamp
-                    },
-                    {
-                        'measurement': 'swarm_info',
-                        'tags': {'metric': 'managers'},
-                        'fields': {'value': swarm_info.get('managers', 0)},
-                        'timestamp': timestamp
-                    }
-                ])
+                rows.append(('swarm_info', {'metric': 'nodes'},
+                             {'value': swarm_info.get('nodes', 0)}, timestamp))
+                rows.append(('swarm_info', {'metric': 'managers'},
+                             {'value': swarm_info.get('managers', 0)}, timestamp))
             
         except Exception as e:
             logger.error(f"Error collecting system metrics: {e}")
         
-        return metrics
+        return rows
     
     def _collect_service_metrics(self, timestamp):
-        """Collect service-specific metrics"""
-        metrics = []
+        """Collect service-specific metrics as (measurement, tags, fields, timestamp) rows"""
+        rows = []
         
         try:
             services = self.docker_manager.get_services()
             
             for service in services:
+                tags = {'service_name': service.name, 'service_id': service.id}
+                
                 # Service replica metrics
-                metrics.extend([
-                    {
-                        'measurement': 'service_replicas',
-                        'tags': {
-                            'service_name': service['name'],
-                            'service_id': service['id']
-                        },
-                        'fields': {
-                            'running': service.get('running_tasks', 0),
-                            'total': service.get('total_tasks', 0),
-                            'desired': service.get('replicas', 0)
-                        },
-                        'timestamp': timestamp
-                    }
-                ])
+                rows.append(('service_replicas', tags, {
+                    'running': service.running_tasks,
+                    'total': service.total_tasks,
+                    'desired': service.replicas
+                }, timestamp))
                 
                 # Service status metric (1 for healthy, 0 for unhealthy)
-                is_healthy = (service.get('running_tasks', 0) == service.get('total_tasks', 0) 
-                             and service.get('total_tasks', 0) > 0)
+                is_healthy = (service.running_tasks == service.total_tasks 
+                             and service.total_tasks > 0)
                 
-                metrics.append({
-                    'measurement': 'service_health',
-                    'tags': {
-                        'service_name': service['name'],
-                        'service_id': service['id']
-                    },
-                    'fields': {'healthy': 1 if is_healthy else 0},
-                    'timestamp': timestamp
-                })
+                if self._status_changed(self._last_health, service.id, is_healthy, timestamp):
+                    rows.append(('service_health', tags, {'healthy': 1 if is_healthy else 0}, timestamp))
             
         except Exception as e:
             logger.error(f"Error collecting service metrics: {e}")
         
-        return metrics
+        return rows
     
     def _collect_node_metrics(self, timestamp):
-        """Collect node-specific metrics"""
-        metrics = []
+        """Collect node-specific metrics as (measurement, tags, fields, timestamp) rows"""
+        rows = []
         
         try:
             nodes = self.docker_manager.get_nodes()
             
             for node in nodes:
+                tags = {'node_id': node.id, 'hostname': node.hostname, 'role': node.role}
+                
                 # Node resource metrics
-                metrics.extend([
-                    {
-                        'measurement': 'node_resources',
-                        'tags': {
-                            'node_id': node['id'],
-                            'hostname': node['hostname'],
-                            'role': node['role']
-                        },
-                        'fields': {
-                            'cpu_cores': node.get('resources', {}).get('cpu', 0),
-                            'memory_gb': node.get('resources', {}).get('memory', 0)
-                        },
-                        'timestamp': timestamp
-                    }
-                ])
+                rows.append(('node_resources', tags, {
+                    'cpu_cores': node.resources.get('cpu', 0),
+                    'memory_gb': node.resources.get('memory', 0)
+                }, timestamp))
                 
                 # Node status metric (1 for ready, 0 for not ready)
-                is_ready = node.get('status') == 'ready'
-                is_available = node.get('availability') == 'active'
+                is_ready = node.status == 'ready'
+                is_available = node.availability == 'active'
                 
-                metrics.append({
-                    'measurement': 'node_status',
-                    'tags': {
-                        'node_id': node['id'],
-                        'hostname': node['hostname'],
-                        'role': node['role']
-                    },
-                    'fields': {
+                if self._status_changed(
+                    self._last_node_status, node.id, (is_ready, is_available), timestamp
+                ):
+                    rows.append(('node_status', tags, {
                         'ready': 1 if is_ready else 0,
                         'available': 1 if is_available else 0
-                    },
-                    'timestamp': timestamp
-                })
+                    }, timestamp))
             
         except Exception as e:
             logger.error(f"Error collecting node metrics: {e}")
         
-        return metrics
+        return rows
     
-    def _store_to_influxdb(self, metrics):
-        """Store metrics to InfluxDB"""
-        if not hasattr(self, 'influxdb_client'):
+    def _status_changed(self, last_emitted: Dict, key: str, value, timestamp: datetime) -> bool:
+        """Record a status and report whether it changed or is due for a heartbeat"""
+        previous = last_emitted.get(key)
+        if previous is not None and previous[0] == value and timestamp - previous[1] < STATUS_HEARTBEAT:
+            return False
+        last_emitted[key] = (value, timestamp)
+        return True
+
+    def _store_to_influxdb(self, rows):
+        """Store (measurement, tags, fields, timestamp) rows to InfluxDB"""
+        if not hasattr(self, '_write_api'):
             return
         
         try:
-            write_api = self.influxdb_client.write_api(write_options=SYNCHRONOUS)
-            
-            points = []
-            for metric in metrics:
-                point = Point(metric['measurement'])
-                
-                # Add tags
-                for tag_key, tag_value in metric.get('tags', {}).items():
-                    point = point.tag(tag_key, str(tag_value))
-                
-                # Add fields
-                for field_key, field_value in metric.get('fields', {}).items():
-                    point = point.field(field_key, field_value)
-                
-                # Set timestamp
-                point = point.time(metric['timestamp'], WritePrecision.S)
-                
-                points.append(point)
-            
-            write_api.write(bucket=self.influxdb_bucket, record=points)
-            logger.info(f"Stored {len(points)} metrics to InfluxDB")
+            # Build line protocol directly rather than through Point objects
+            lines = [line for line in (to_line_protocol(*row) for row in rows) if line is not None]
+            if not lines:
+                return
+
+            self._write_api.write(
+                bucket=self.influxdb_bucket,
+                record='\n'.join(lines),
+                write_precision=WritePrecision.S
+            )
+            logger.info(f"Queued {len(lines)} metrics for InfluxDB")
             
         except Exception as e:
             logger.error(f"Error storing metrics to InfluxDB: {e}")
     
-    def _store_to_prometheus(self, system_metrics, service_metrics, node_metrics):
-        """Store metrics to Prometheus"""
+    def _store_to_prometheus(self, rows):
+        """Store (measurement, tags, fields, timestamp) rows to Prometheus"""
         if not hasattr(self, 'prometheus_registry'):
             return
         
         try:
-            # Update service metrics
-            for metric in service_metrics:
-                if metric['measurement'] == 'service_replicas':
-                    tags = metric['tags']
-                    fields = metric['fields']
-                    
-                    self.prom_service_replicas.labels(
-                        service_name=tags['service_name'],
-                        service_id=tags['service_id']
-                    ).set(fields['running'])
-                    
-                    self.prom_service_replicas_desired.labels(
-                        service_name=tags['service_name'],
-                        service_id=tags['service_id']
-                    ).set(fields['desired'])
-            
-            # Update node metrics
-            for metric in node_metrics:
-                if metric['measurement'] == 'node_resources':
-                    tags = metric['tags']
-                    fields = metric['fields']
-                    
-                    self.prom_node_cpu.labels(
-                        node_id=tags['node_id'],
-                        hostname=tags['hostname'],
-                        role=tags['role']
-                    ).set(fields['cpu_cores'])
-                    
-                    self.prom_node_memory.labels(
-                        node_id=tags['node_id'],
-                        hostname=tags['hostname'],
-                        role=tags['role']
-                    ).set(fields['memory_gb'] * 1024 * 1024 * 1024)  # Convert GB to bytes
-            
-            # Update system metrics
-            for metric in system_metrics:
-                if metric['measurement'] == 'system_containers':
-                    self.prom_system_containers.labels(
-                        state=metric['tags']['state']
-                    ).set(metric['fields']['value'])
-            
-            # Push to gateway if configured
-            prometheus_gateway = getattr(settings, 'PROMETHEUS_PUSHGATEWAY_URL', None)
-            if prometheus_gateway:
-                push_to_gateway(
-                    prometheus_gateway,
-                    job='swarm-manager',
-                    registry=self.prometheus_registry
-                )
+            seen = set()
+            child = partial(self._prom_child, seen)
+
+            # One pass, dispatching each row to its measurement's gauge updater
+            handlers = self._prom_handlers
+            for measurement, tags, fields, _ in rows:
+                handler = handlers.get(measurement)
+                if handler is not None:
+                    handler(child, tags, fields)
+
+            # Drop series for services and nodes that no longer exist
+            for key in self._prom_children.keys() - seen:
+                gauge, labels = key
+                gauge.remove(*labels)
+                del self._prom_children[key]
+            
+            # Queue a push if configured; a push already pending will send
+            # the registry's latest values, so a full queue needs nothing more
+            if self._prom_gateway:
+                try:
+                    self._push_queue.put_nowait(True)
+                except queue.Full:
+                    pass
             
             logger.info("Updated Prometheus metrics")
             
         except Exception as e:
             logger.error(f"Error storing metrics to Prometheus: {e}")
     
-    def _store_to_database(self, metrics):
-        """Store metrics to Django database"""
+    def _push_worker(self):
+        """Push the registry to the gateway whenever a push is queued"""
+        while True:
+            self._push_queue.get()
+            try:
+                push_to_gateway(
+                    self._prom_gateway,
+                    job='swarm-manager',
+                    registry=self.prometheus_registry
+                )
+            except Exception as e:
+                logger.error(f"Error pushing metrics to Prometheus gateway: {e}")
+
+    def _prom_set_service_replicas(self, child, tags, fields):
+        """Update the running and desired replica gauges for a service"""
+        labels = (tags['service_name'], tags['service_id'])
+        child(self.prom_service_replicas, labels).set(fields['running'])
+        child(self.prom_service_replicas_desired, labels).set(fields['desired'])
+
+    def _prom_set_node_resources(self, child, tags, fields):
+        """Update the CPU and memory gauges for a node"""
+        labels = (tags['node_id'], tags['hostname'], tags['role'])
+        child(self.prom_node_cpu, labels).set(fields['cpu_cores'])
+        child(self.prom_node_memory, labels).set(
+            fields['memory_gb'] * 1024 * 1024 * 1024  # Convert GB to bytes
+        )
+
+    def _prom_set_system_containers(self, child, tags, fields):
+        """Update the container count gauge for a state"""
+        child(self.prom_system_containers, (tags['state'],)).set(fields['value'])
+
+    def _prom_child(self, seen, gauge, labels):
+        """Get a gauge's child for the given label values, resolving it only once"""
+        key = (gauge, labels)
+        seen.add(key)
+        child = self._prom_children.get(key)
+        if child is None:
+            child = self._prom_children[key] = gauge.labels(*labels)
+        return child
+
+    def _store_to_database(self, rows):
+        """Store (measurement, tags, fields, timestamp) rows to Django database"""
         from .models import Metric
         
         try:
-            metric_objects = []
-            
-            for metric_data in metrics:
-                metric_obj = Metric(
-                    measurement=metric_data['measurement'],
-                    tags=metric_data.get('tags', {}),
-                    fields=metric_data.get('fields', {}),
-                    timestamp=metric_data['timestamp']
-                )
-                metric_objects.append(metric_obj)
+            from_point = Metric.from_point
+            metric_objects = [from_point(*row) for row in rows]
             
-            # Bulk create for performance
+            # Bulk create for performance; all batches share one transaction
             Metric.objects.bulk_create(metric_objects, batch_size=1000)
             logger.info(f"Stored {len(metric_objects)} metrics to database")
             
         except Exception as e:
             logger.error(f"Error storing metrics to database: {e}")
     
+    def store_metric(self, measurement: str, tags: Dict, fields: Dict, timestamp: datetime):
+        """Store a single metric point in the configured backend"""
+        self.store_metrics_bulk([(measurement, tags, fields, timestamp)])
+
+    def store_metrics_bulk(self, rows):
+        """Store (measurement, tags, fields, timestamp) rows in one backend write"""
+        if not rows:
+            return
+
+        if self.storage_backend == 'influxdb':
+            self._store_to_influxdb(rows)
+        else:
+            self._store_to_database(rows)
+
+    def get_services_data(self) -> List[Dict]:
+        """Get raw swarm services annotated with running and desired replica counts"""
+        try:
+            with self._topology_lock:
+                watched = None if self._services is None else [dict(s) for s in self._services.values()]
+            if watched is not None:
+                # Specs come from the event cache; task states still need a poll
+                return self._annotate_replicas(watched)
+
+            if not self.docker_manager.client or not self.docker_manager.is_swarm_active():
+                return []
+
+            return self._fetch_services_data()
+
+        except Exception as e:
+            logger.error(f"Error getting services data: {e}")
+            return []
+
+    @cached_with_fallback('swarm:services:v1', ttl=SWARM_DATA_CACHE_TTL)
+    def _fetch_services_data(self) -> List[Dict]:
+        """Fetch services and count their running tasks"""
+        return self._annotate_replicas(self.docker_manager.client.api.services())
+
+    def _annotate_replicas(self, services: List[Dict]) -> List[Dict]:
+        """Add running and desired replica counts to raw service dicts"""
+        running = defaultdict(int)
+        for task in self.docker_manager.client.api.tasks(filters={'desired-state': 'running'}):
+            if task['Status']['State'] == 'running':
+                running[task['ServiceID']] += 1
+
+        for service in services:
+            replicated = service.get('Spec', {}).get('Mode', {}).get('Replicated')
+            service['replicas_running'] = running[service.get('ID')]
+            service['replicas_desired'] = (
+                replicated.get('Replicas', 0) if replicated else service['replicas_running']
+            )
+        return services
+
+    def get_service_replicas(self) -> List[Dict]:
+        """Get services flattened to {id, name, running, desired} dicts"""
+        services = []
+        for service in self.get_services_data():
+            service_id = service.get('ID')
+            if not service_id:
+                continue
+            services.append({
+                'id': service_id,
+                'name': service.get('Spec', {}).get('Name', service_id),
+                'running': service.get('replicas_running', 0),
+                'desired': service.get('replicas_desired', 0),
+            })
+        return services
+
+    def get_nodes_data(self) -> List[Dict]:
+        """Get raw swarm node descriptions"""
+        try:
+            with self._topology_lock:
+                if self._nodes is not None:
+                    return list(self._nodes.values())
+
+            if not self.docker_manager.client or not self.docker_manager.is_swarm_active():
+                return []
+
+            return self._fetch_nodes_data()
+
+        except Exception as e:
+            logger.error(f"Error getting nodes data: {e}")
+            return []
+
+    @cached_with_fallback('swarm:nodes:v1', ttl=SWARM_DATA_CACHE_TTL)
+    def _fetch_nodes_data(self) -> List[Dict]:
+        """Fetch node descriptions"""
+        return self.docker_manager.client.api.nodes()
+
+    def start_event_watcher(self) -> bool:
+        """Seed the swarm topology cache and keep it current from Docker events"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return True
+
+        try:
+            if not self.docker_manager.client or not self.docker_manager.is_swarm_active():
+                return False
+
+            api = self.docker_manager.client.api
+            # Subscribe from before the seed so no change between the two is lost
+            since = int(time.time())
+            services = {service['ID']: service for service in api.services()}
+            nodes = {node['ID']: node for node in api.nodes()}
+            events = api.events(
+                since=since, filters={'type': ['service', 'node']}, decode=True
+            )
+        except Exception as e:
+            logger.error(f"Error starting swarm event watcher: {e}")
+            return False
+
+        with self._topology_lock:
+            self._services = services
+            self._nodes = nodes
+
+        self._watcher = threading.Thread(
+            target=self._watch_events, args=(events,), name='swarm-event-watcher', daemon=True
+        )
+        self._watcher.start()
+        logger.info("Started swarm event watcher")
+        return True
+
+    def _watch_events(self, events):
+        """Apply service and node events to the topology cache"""
+        api = self.docker_manager.client.api
+        inspectors = {
+            'service': (self._services, api.inspect_service),
+            'node': (self._nodes, api.inspect_node),
+        }
+
+        try:
+            for event in events:
+                target = inspectors.get(event.get('Type'))
+                object_id = event.get('Actor', {}).get('ID')
+                if target is None or not object_id:
+                    continue
+
+                cache, inspect = target
+                if event.get('Action') == 'remove':
+                    with self._topology_lock:
+                        cache.pop(object_id, None)
+                    continue
+
+                try:
+                    current = inspect(object_id)
+                except Exception as e:
+                    logger.warning(f"Error inspecting {event['Type']} {object_id}: {e}")
+                    continue
+                with self._topology_lock:
+                    cache[object_id] = current
+        except Exception as e:
+            logger.error(f"Swarm event stream stopped: {e}")
+        finally:
+            # Fall back to polling until the watcher is restarted
+            with self._topology_lock:
+                self._services = None
+                self._nodes = None
+
     def get_historical_data(self, measurement: str, tags: Dict = None, 
                            start_time: datetime = None, end_time: datetime = None) -> List[Dict]:
         """Get historical metrics data"""
-        if not start_time:
-            start_time = timezone.now() - timedelta(hours=24)
         if not end_time:
             end_time = timezone.now()
+        if not start_time:
+            start_time = end_time - timedelta(hours=24)
         
         if self.storage_backend == 'influxdb':
             return self._query_influxdb(measurement, tags, start_time, end_time)
@@ -443,7 +748,56 @@ class MetricsCollector:
         else:
             return []
     
-    def _query_influxdb(self, measurement: str, tags: Dict, start_time: datetime, end_time: datetime) -> List[Dict]:
+    def get_cached_historical_data(self, measurement: str, tags: Dict = None,
+                                   start_time: datetime = None, end_time: datetime = None) -> List[Dict]:
+        """Get historical metrics data through the shared chunk cache"""
+        if not end_time:
+            end_time = timezone.now()
+        if not start_time:
+            start_time = end_time - timedelta(hours=24)
+
+        # InfluxDB queries are downsampled to 5 minute windows, database rows are raw
+        resolution = 300 if self.storage_backend == 'influxdb' else 0
+
+        return aggregate_cache.get_range(
+            self.get_historical_data, measurement, tags, start_time, end_time, resolution
+        )
+    
+    def get_tag_averages(self, measurement: str, tags: Dict = None,
+                         start_time: datetime = None, end_time: datetime = None) -> List[Dict]:
+        """Average each tag combination over the range, aggregating in the backend"""
+        if not end_time:
+            end_time = timezone.now()
+        if not start_time:
+            start_time = end_time - timedelta(hours=24)
+
+        if self.storage_backend == 'influxdb':
+            # One mean per series from InfluxDB instead of every 5 minute window
+            points = self._query_influxdb(
+                measurement, tags, start_time, end_time, aggregation='|> mean()'
+            )
+            values = ((point['tags'], point['value']) for point in points)
+        elif self.storage_backend == 'database':
+            values = self._iter_database_values(measurement, tags, start_time, end_time)
+        else:
+            return []
+
+        sums = defaultdict(float)
+        counts = defaultdict(int)
+        for point_tags, value in values:
+            if not isinstance(value, (int, float)):
+                continue
+            key = tag_label(point_tags)
+            sums[key] += value
+            counts[key] += 1
+
+        return [
+            {'label': key, 'value': total / counts[key], 'count': counts[key]}
+            for key, total in sums.items()
+        ]
+
+    def _query_influxdb(self, measurement: str, tags: Dict, start_time: datetime, end_time: datetime,
+                        aggregation: str = INFLUXDB_HISTORY_AGGREGATION) -> List[Dict]:
         """Query InfluxDB for historical data"""
         if not hasattr(self, 'influxdb_client'):
             return []
@@ -463,7 +817,7 @@ class MetricsCollector:
                 for tag_key, tag_value in tags.items():
                     query += f'\n|> filter(fn: (r) => r.{tag_key} == "{tag_value}")'
             
-            query += '\n|> aggregateWindow(every: 5m, fn: mean, createEmpty: false)'
+            query += f'\n{aggregation}'
             
             result = query_api.query(org=self.influxdb_org, query=query)
             
@@ -497,19 +851,21 @@ class MetricsCollector:
             
             # Apply tag filters
             if tags:
-                for tag_key, tag_value in tags.items():
-                    queryset = queryset.filter(tags__contains={tag_key: tag_value})
+                queryset = Metric.filter_by_tags(queryset, tags)
             
             queryset = queryset.order_by('timestamp')
             
+            # Project only the needed columns and stream them without
+            # building model instances
             data = []
-            for metric in queryset:
-                for field_key, field_value in metric.fields.items():
+            rows = queryset.values_list('timestamp', 'fields', 'tags').iterator(chunk_size=2000)
+            for timestamp, fields, metric_tags in rows:
+                for field_key, field_value in fields.items():
                     data.append({
-                        'timestamp': metric.timestamp,
+                        'timestamp': timestamp,
                         'value': field_value,
                         'field': field_key,
-                        'tags': metric.tags
+                        'tags': metric_tags
                     })
             
             return data
@@ -518,22 +874,32 @@ class MetricsCollector:
             logger.error(f"Error querying database: {e}")
             return []
     
+    def _iter_database_values(self, measurement: str, tags: Dict, start_time: datetime,
+                              end_time: datetime):
+        """Yield (tags, value) for every stored field, streaming straight from the database"""
+        from .models import Metric
+
+        queryset = Metric.objects.filter(
+            measurement=measurement,
+            timestamp__gte=start_time,
+            timestamp__lte=end_time
+        ).order_by()
+        if tags:
+            queryset = Metric.filter_by_tags(queryset, tags)
+
+        for metric_tags, fields in queryset.values_list('tags', 'fields').iterator(chunk_size=2000):
+            for value in fields.values():
+                yield metric_tags, value
+
     def get_service_metrics_summary(self, service_id: str, hours: int = 24) -> Dict:
         """Get metrics summary for a specific service"""
         start_time = timezone.now() - timedelta(hours=hours)
         
-        # Get service replica data
-        replica_data = self.get_historical_data(
-            'service_replicas',
-            {'service_id': service_id},
-            start_time
-        )
-        
-        # Get service health data
-        health_data = self.get_historical_data(
-            'service_health',
-            {'service_id': service_id},
-            start_time
+        # Replica and health history are independent queries; run them together
+        tags = {'service_id': service_id}
+        replica_data, health_data = run_in_parallel(
+            partial(self.get_historical_data, 'service_replicas', tags, start_time),
+            partial(self.get_historical_data, 'service_health', tags, start_time),
         )
         
         # Calculate summary statistics
@@ -553,24 +919,40 @@ class MetricsCollector:
             }
         }
         
-        # Calculate replica statistics
-        running_values = [d['value'] for d in replica_data if d['field'] == 'running']
-        if running_values:
+        # Calculate replica statistics in a single pass
+        count = total = 0
+        low = high = None
+        for d in replica_data:
+            if d['field'] != 'running':
+                continue
+            value = d['value']
+            count += 1
+            total += value
+            if low is None or value < low:
+                low = value
+            if high is None or value > high:
+                high = value
+        if count:
             summary['replica_metrics'].update({
-                'avg_running': sum(running_values) / len(running_values),
-                'min_running': min(running_values),
-                'max_running': max(running_values)
+                'avg_running': total / count,
+                'min_running': low,
+                'max_running': high
             })
         
-        # Calculate health statistics
-        healthy_values = [d['value'] for d in health_data if d['field'] == 'healthy']
-        if healthy_values:
-            uptime_percentage = (sum(healthy_values) / len(healthy_values)) * 100
-            downtime_minutes = (len([v for v in healthy_values if v == 0]) * 5)  # Assuming 5-minute intervals
-            
+        # Calculate health statistics in a single pass
+        count = total = down = 0
+        for d in health_data:
+            if d['field'] != 'healthy':
+                continue
+            value = d['value']
+            count += 1
+            total += value
+            if value == 0:
+                down += 1
+        if count:
             summary['health_metrics'].update({
-                'uptime_percentage': uptime_percentage,
-                'downtime_minutes': downtime_minutes
+                'uptime_percentage': (total / count) * 100,
+                'downtime_minutes': down * 5  # Assuming 5-minute intervals
             })
         
         return summary
@@ -581,43 +963,212 @@ class MetricsCollector:
         
         if self.storage_backend == 'database':
             from .models import Metric
-            deleted_count, _ = Metric.objects.filter(timestamp__lt=cutoff_date).delete()
+
+            # Purge window by window from the oldest row so each DELETE is a
+            # bounded index range and never holds the write lock for the
+            # whole backlog
+            oldest = Metric.objects.filter(timestamp__lt=cutoff_date).aggregate(
+                oldest=Min('timestamp')
+            )['oldest']
+            deleted_count = 0
+            while oldest is not None and oldest < cutoff_date:
+                oldest = min(oldest + METRIC_CLEANUP_WINDOW, cutoff_date)
+                deleted, _ = Metric.objects.filter(timestamp__lt=oldest).delete()
+                deleted_count += deleted
+
             logger.info(f"Cleaned up {deleted_count} old metrics from database")
             return deleted_count
         
         # For InfluxDB and Prometheus, cleanup is typically handled by retention policies
         return 0
 
+    def refresh_hourly_rollup(self, hours: int = 2, backfill: bool = False) -> int:
+        """Rebuild the hourly rollup buckets for the most recent hours, or all of them"""
+        from .models import Metric, MetricHourlyRollup
+
+        if self.storage_backend != 'database':
+            return 0
+
+        # Recompute from the start of the oldest bucket so late points are included
+        start_bucket = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+        if backfill:
+            oldest = Metric.objects.aggregate(oldest=Min('timestamp'))['oldest']
+            if oldest is not None:
+                start_bucket = min(start_bucket, oldest.replace(minute=0, second=0, microsecond=0))
+
+        buckets = {}
+        queryset = Metric.objects.filter(timestamp__gte=start_bucket).values_list(
+            'measurement', 'tags', 'fields', 'timestamp'
+        )
+        for measurement, tags, fields, timestamp in queryset.iterator():
+            bucket = timestamp.replace(minute=0, second=0, microsecond=0)
+            tags_key = json.dumps(tags, sort_keys=True)
+
+            for field_key, field_value in fields.items():
+                if not isinstance(field_value, (int, float)):
+                    continue
+
+                key = (measurement, tags_key, field_key, bucket)
+                entry = buckets.get(key)
+                if entry is None:
+                    buckets[key] = [field_value, 1, field_value, field_value]
+                else:
+                    entry[0] += field_value
+                    entry[1] += 1
+                    entry[2] = min(entry[2], field_value)
+                    entry[3] = max(entry[3], field_value)
+
+        rollups = []
+        for (measurement, tags_key, field_key, bucket), (value_sum, value_count, value_min, value_max) in buckets.items():
+            tags = json.loads(tags_key)
+            rollups.append(MetricHourlyRollup(
+                measurement=measurement,
+                tags=tags,
+                field=field_key,
+                bucket=bucket,
+                value_sum=value_sum,
+                value_count=value_count,
+                value_min=value_min,
+                value_max=value_max,
+                **Metric.tag_columns(tags)
+            ))
+
+        with transaction.atomic():
+            MetricHourlyRollup.objects.filter(bucket__gte=start_bucket).delete()
+            MetricHourlyRollup.objects.bulk_create(rollups, batch_size=1000)
+
+        logger.info(f"Refreshed {len(rollups)} hourly rollup buckets")
+        return len(rollups)
+
+    def get_hourly_rollup(self, measurement: str, tags: Dict = None,
+                          start_time: datetime = None, end_time: datetime = None) -> List[Dict]:
+        """Get hourly aggregated data from the rollup table
+
+        Returns an empty list when the rollup doesn't cover the range, so
+        callers fall back to raw metrics.
+        """
+        from .models import Metric, MetricHourlyRollup
+
+        if self.storage_backend != 'database':
+            return []
+
+        try:
+            start_bucket = start_time.replace(minute=0, second=0, microsecond=0)
+            if not self._rollup_covers(measurement, start_bucket, end_time):
+                return []
+
+            queryset = MetricHourlyRollup.objects.filter(
+                measurement=measurement,
+                bucket__gte=start_bucket,
+                bucket__lt=end_time
+            )
+
+            # Hot tags filter on indexed columns; JSON containment isn't
+            # available on SQLite, so any other tags are matched per row
+            extra_tags = {}
+            for key, value in (tags or {}).items():
+                column = Metric.TAG_COLUMNS.get(key)
+                if column:
+                    queryset = queryset.filter(**{column: value})
+                else:
+                    extra_tags[key] = value
+
+            # Merge field rows into a single value per hour
+            hours = {}
+            for bucket, row_tags, value_sum, value_count, value_min, value_max in queryset.values_list(
+                'bucket', 'tags', 'value_sum', 'value_count', 'value_min', 'value_max'
+            ):
+                if extra_tags and any(row_tags.get(k) != v for k, v in extra_tags.items()):
+                    continue
+                entry = hours.get(bucket)
+                if entry is None:
+                    hours[bucket] = [value_sum, value_count, value_min, value_max]
+                else:
+                    entry[0] += value_sum
+                    entry[1] += value_count
+                    entry[2] = min(entry[2], value_min)
+                    entry[3] = max(entry[3], value_max)
+
+            return [
+                {
+                    'timestamp': bucket.isoformat(),
+                    'value': value_sum / value_count if value_count else 0,
+                    'min': value_min,
+                    'max': value_max,
+                    'count': value_count
+                }
+                for bucket, (value_sum, value_count, value_min, value_max) in sorted(hours.items())
+            ]
+
+        except Exception as e:
+            logger.error(f"Error querying hourly rollup: {e}")
+            return []
+
+    def _rollup_covers(self, measurement: str, start_bucket: datetime, end_time: datetime) -> bool:
+        """Whether the rollup holds every hour of raw data between the two times"""
+        from .models import Metric, MetricHourlyRollup
+
+        rollup = MetricHourlyRollup.objects.filter(measurement=measurement).aggregate(
+            first=Min('bucket'), last=Max('bucket')
+        )
+        if rollup['first'] is None:
+            return False
+
+        raw = Metric.objects.filter(measurement=measurement).aggregate(
+            first=Min('timestamp'), last=Max('timestamp')
+        )
+        if raw['first'] is None:
+            return True
+
+        # Hours before the oldest raw point have nothing to roll up
+        needed_first = max(start_bucket, raw['first'].replace(minute=0, second=0, microsecond=0))
+        # A stale rollup (refresh not running) misses the newest hours
+        needed_last = min(end_time, raw['last']).replace(minute=0, second=0, microsecond=0)
+        return rollup['first'] <= needed_first and rollup['last'] >= needed_last
+
+
+_metrics_collector = None
+_metrics_collector_lock = threading.Lock()
+
+
+def get_metrics_collector() -> MetricsCollector:
+    """Get the shared per-process metrics collector"""
+    global _metrics_collector
+    if _metrics_collector is None:
+        with _metrics_collector_lock:
+            if _metrics_collector is None:
+                _metrics_collector = MetricsCollector()
+    return _metrics_collector
+
 
 class DashboardBuilder:
     """Build custom dashboards for metrics visualization"""
     
     def __init__(self):
-        self.metrics_collector = MetricsCollector()
+        self.metrics_collector = get_metrics_collector()
     
     def get_dashboard_data(self, dashboard_config: Dict, time_range: str = '24h') -> Dict:
         """Get data for a custom dashboard"""
         
         # Parse time range
-        if time_range.endswith('h'):
-            hours = int(time_range[:-1])
-            start_time = timezone.now() - timedelta(hours=hours)
-        elif time_range.endswith('d'):
-            days = int(time_range[:-1])
-            start_time = timezone.now() - timedelta(days=days)
+        now = timezone.now()
+        unit = TIME_RANGE_UNITS.get(time_range[-1:])
+        if unit:
+            start_time = now - timedelta(**{unit: int(time_range[:-1])})
         else:
-            start_time = timezone.now() - timedelta(hours=24)
+            start_time = now - timedelta(hours=24)
         
         dashboard_data = {
             'time_range': time_range,
-            'generated_at': timezone.now(),
+            'generated_at': now,
             'panels': []
         }
         
-        # Process each panel in the dashboard
-        for panel in dashboard_config.get('panels', []):
-            panel_data = self._get_panel_data(panel, start_time)
-            dashboard_data['panels'].append(panel_data)
+        # Panels query independently, so fetch them concurrently
+        dashboard_data['panels'] = map_in_parallel(
+            lambda panel: self._get_panel_data(panel, start_time),
+            dashboard_config.get('panels', [])
+        )
         
         return dashboard_data
     
@@ -626,14 +1177,18 @@ class DashboardBuilder:
         panel_type = panel_config.get('type', 'line')
         measurement = panel_config.get('measurement')
         tags = panel_config.get('tags', {})
+
+        # Bar charts only need one average per tag combination, which the
+        # backend computes without shipping every point
+        if panel_type == 'bar':
+            averages = self.metrics_collector.get_tag_averages(measurement, tags, start_time)
+            return self._format_bar_chart_data(averages, panel_config)
         
-        data = self.metrics_collector.get_historical_data(measurement, tags, start_time)
+        data = self.metrics_collector.get_cached_historical_data(measurement, tags, start_time)
         
         # Format data based on panel type
         if panel_type == 'line':
             return self._format_line_chart_data(data, panel_config)
-        elif panel_type == 'bar':
-            return self._format_bar_chart_data(data, panel_config)
         elif panel_type == 'gauge':
             return self._format_gauge_data(data, panel_config)
         else:
@@ -641,57 +1196,28 @@ class DashboardBuilder:
     
     def _format_line_chart_data(self, data: List[Dict], config: Dict) -> Dict:
         """Format data for line charts"""
-        # Group data by field and tags
-        series = {}
+        # Group data by field
+        series = defaultdict(list)
         
         for point in data:
-            field = point['field']
-            timestamp = point['timestamp']
-            value = point['value']
-            
-            series_key = f"{field}"
-            if series_key not in series:
-                series[series_key] = {
-                    'name': field,
-                    'data': []
-                }
-            
-            series[series_key]['data'].append({
-                'x': timestamp.isoformat(),
-                'y': value
+            series[point['field']].append({
+                'x': point['timestamp'].isoformat(),
+                'y': point['value']
             })
         
         return {
             'type': 'line',
             'title': config.get('title', 'Chart'),
-            'series': list(series.values()),
+            'series': [{'name': field, 'data': points} for field, points in series.items()],
             'config': config
         }
     
-    def _format_bar_chart_data(self, data: List[Dict], config: Dict) -> Dict:
-        """Format data for bar charts"""
-        # Aggregate data by tags
-        aggregated = {}
-        
-        for point in data:
-            tags = point.get('tags', {})
-            key = '_'.join([f"{k}:{v}" for k, v in tags.items()])
-            
-            if key not in aggregated:
-                aggregated[key] = {'label': key, 'value': 0, 'count': 0}
-            
-            aggregated[key]['value'] += point['value']
-            aggregated[key]['count'] += 1
-        
-        # Calculate averages
-        for item in aggregated.values():
-            if item['count'] > 0:
-                item['value'] = item['value'] / item['count']
-        
+    def _format_bar_chart_data(self, averages: List[Dict], config: Dict) -> Dict:
+        """Format per-tag averages for bar charts"""
         return {
             'type': 'bar',
             'title': config.get('title', 'Chart'),
-            'data': list(aggregated.values()),
+            'data': averages,
             'config': config
         }
     
@@ -714,4 +1240,18 @@ class DashboardBuilder:
             'value': latest_point['value'],
             'timestamp': latest_point['timestamp'].isoformat(),
             'config': config
-        }
\ No newline at end of file
+        }
+
+
+_dashboard_builder = None
+_dashboard_builder_lock = threading.Lock()
+
+
+def get_dashboard_builder() -> DashboardBuilder:
+    """Get the shared per-process dashboard builder"""
+    global _dashboard_builder
+    if _dashboard_builder is None:
+        with _dashboard_builder_lock:
+            if _dashboard_builder is None:
+                _dashboard_builder = DashboardBuilder()
+    return _dashboard_builder
@@ -1,8 +1,14 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+import hashlib
 import json
 
+from .compose_utils import compose_metadata, load_yaml
+
 User = get_user_model()
 
 
@@ -24,7 +30,10 @@ class ServiceGroup(models.Model):
         return self.name
 
     def get_services_count(self):
-        """Get count of services in this group"""
+        """Get count of services in this group, preferring an annotated count"""
+        annotated = getattr(self, 'services_count', None)
+        if annotated is not None:
+            return annotated
         return self.service_group_mappings.count()
 
 
@@ -60,6 +69,7 @@ class ComposeStack(models.Model):
     services_count = models.IntegerField(default=0)
     networks_list = models.JSONField(default=list, blank=True)
     volumes_list = models.JSONField(default=list, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
 
     # Management
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -79,32 +89,62 @@ class ComposeStack(models.Model):
     ]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=DRAFT)
 
+    # Columns derived from compose_content
+    METADATA_FIELDS = ['content_hash', 'services_count', 'networks_list', 'volumes_list', 'updated_at']
+
     class Meta:
         ordering = ['-updated_at']
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Derive metadata in the same write whenever the content changed
+        if self._refresh_metadata() and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *self.METADATA_FIELDS}
+        super().save(*args, **kwargs)
+
     def get_compose_data(self):
-        """Parse compose content as YAML"""
+        """Parse compose content as YAML, reusing the last parse while the content is unchanged"""
+        cached = getattr(self, '_compose_cache', None)
+        if cached is not None and cached[0] == self.compose_content:
+            return cached[1]
+
         try:
-            import yaml
-            return yaml.safe_load(self.compose_content)
+            data = load_yaml(self.compose_content)
         except Exception:
             return {}
 
+        self._compose_cache = (self.compose_content, data)
+        return data
+
+    def _refresh_metadata(self):
+        """Recompute derived metadata if the compose content changed since the last parse"""
+        content_hash = hashlib.sha256(self.compose_content.encode()).hexdigest()
+        if content_hash == self.content_hash:
+            return False
+
+        try:
+            services_count, networks_list, volumes_list = compose_metadata(self.get_compose_data())
+        except Exception:
+            return False
+
+        self.services_count = services_count
+        self.networks_list = networks_list
+        self.volumes_list = volumes_list
+        self.content_hash = content_hash
+        return True
+
     def update_metadata(self):
         """Update metadata from compose content"""
         try:
-            compose_data = self.get_compose_data()
-            services = compose_data.get('services', {})
-            networks = compose_data.get('networks', {})
-            volumes = compose_data.get('volumes', {})
-
-            self.services_count = len(services)
-            self.networks_list = list(networks.keys())
-            self.volumes_list = list(volumes.keys())
-            self.save()
+            # Only the derived columns changed; write them with a bare UPDATE
+            # that skips the full save() path and its signals
+            if self._refresh_metadata():
+                self.updated_at = timezone.now()
+                type(self).objects.filter(pk=self.pk).update(
+                    **{field: getattr(self, field) for field in self.METADATA_FIELDS}
+                )
         except Exception:
             pass
 
@@ -123,7 +163,11 @@ class ServiceLog(models.Model):
     # Metadata
     node_id = models.CharField(max_length=100, blank=True)
     task_id = models.CharField(max_length=100, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Indexed so cleanup_old_logs is a range scan rather than a full table scan
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    # Span of rows removed per DELETE by cleanup_old_logs
+    CLEANUP_WINDOW = timezone.timedelta(hours=6)
 
     class Meta:
         ordering = ['-timestamp']
@@ -136,11 +180,28 @@ class ServiceLog(models.Model):
     def __str__(self):
         return f"{self.service_name} - {self.timestamp} - {self.level}"
 
+    @classmethod
+    def bulk_ingest(cls, entries, batch_size=1000):
+        """Store an iterable of field dicts with multi-row INSERTs"""
+        return cls.objects.bulk_create([cls(**entry) for entry in entries], batch_size=batch_size)
+
     @classmethod
     def cleanup_old_logs(cls, days=7):
         """Remove logs older than specified days"""
         cutoff_date = timezone.now() - timezone.timedelta(days=days)
-        return cls.objects.filter(created_at__lt=cutoff_date).delete()
+
+        # Delete one window at a time from the oldest row so no single
+        # statement scans or locks the whole backlog
+        oldest = cls.objects.filter(created_at__lt=cutoff_date).aggregate(
+            oldest=models.Min('created_at')
+        )['oldest']
+        deleted_count = 0
+        while oldest is not None and oldest < cutoff_date:
+            oldest = min(oldest + cls.CLEANUP_WINDOW, cutoff_date)
+            deleted, _ = cls.objects.filter(created_at__lt=oldest).delete()
+            deleted_count += deleted
+
+        return deleted_count, {cls._meta.label: deleted_count}
 
 
 class DeploymentHistory(models.Model):
@@ -173,25 +234,155 @@ class DeploymentHistory(models.Model):
         return f"{self.stack.name} - {self.deployed_at} - {self.status}"
 
 
+class ComposeImportDraft(models.Model):
+    """Hold an imported compose file between import, review and save"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='compose_import_drafts')
+    services = models.JSONField(default=list)
+    metadata = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    # Status of the background clone and conversion
+    PENDING = 'pending'
+    READY = 'ready'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (READY, 'Ready'),
+        (FAILED, 'Failed'),
+    ]
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=READY)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.user} - {self.created_at}"
+
+    @classmethod
+    def cleanup_old_drafts(cls, days=1):
+        """Remove drafts older than specified days"""
+        cutoff_date = timezone.now() - timezone.timedelta(days=days)
+        return cls.objects.filter(created_at__lt=cutoff_date).delete()
+
+
 class Metric(models.Model):
     """Store time-series metrics data"""
+
+    # Hot tag keys copied into indexed columns so filters avoid JSON scans
+    TAG_COLUMNS = {
+        'resource': 'resource',
+        'service_id': 'entity_id',
+        'node_id': 'entity_id',
+        'service_name': 'entity_name',
+        'node_hostname': 'entity_name',
+        'hostname': 'entity_name',
+    }
     
     measurement = models.CharField(max_length=100, db_index=True)
     tags = models.JSONField(default=dict, blank=True)
     fields = models.JSONField(default=dict)
     timestamp = models.DateTimeField(db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    # Denormalized from tags
+    resource = models.CharField(max_length=50, null=True, blank=True)
+    entity_id = models.CharField(max_length=100, null=True, blank=True)
+    entity_name = models.CharField(max_length=255, null=True, blank=True)
     
     class Meta:
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['measurement', '-timestamp']),
             models.Index(fields=['timestamp']),
+            models.Index(fields=['measurement', 'resource', '-timestamp']),
+            models.Index(fields=['measurement', 'entity_id', '-timestamp']),
         ]
     
     def __str__(self):
         return f"{self.measurement} - {self.timestamp}"
 
+    @classmethod
+    def tag_columns(cls, tags):
+        """Hot tag column values for a tags dict"""
+        return {column: tags[key] for key, column in cls.TAG_COLUMNS.items() if key in tags}
+
+    @classmethod
+    def from_point(cls, measurement, tags, fields, timestamp):
+        """Build an unsaved Metric with its hot tag columns filled in"""
+        tags = tags or {}
+        return cls(
+            measurement=measurement, tags=tags, fields=fields, timestamp=timestamp,
+            **cls.tag_columns(tags)
+        )
+
+    @classmethod
+    def filter_by_tags(cls, queryset, tags):
+        """Filter on hot tag columns, falling back to JSON containment for other keys"""
+        extra_tags = {}
+        for key, value in tags.items():
+            column = cls.TAG_COLUMNS.get(key)
+            if column:
+                # Rows written before the column existed (and not yet touched
+                # by backfill_metric_tags) only carry the value in the JSON tags
+                queryset = queryset.filter(
+                    Q(**{column: value}) | Q(**{f'{column}__isnull': True, f'tags__{key}': value})
+                )
+            else:
+                extra_tags[key] = value
+        if extra_tags:
+            queryset = queryset.filter(tags__contains=extra_tags)
+        return queryset
+
+    @classmethod
+    def distinct_entity_ids(cls, queryset, tag_key):
+        """Distinct entity ids in the queryset, reading the JSON tag on rows not yet backfilled"""
+        return (
+            queryset.annotate(
+                tagged_id=Coalesce(
+                    'entity_id', KeyTextTransform(tag_key, 'tags'), output_field=models.CharField()
+                )
+            )
+            .filter(tagged_id__isnull=False)
+            .order_by()
+            .values_list('tagged_id', flat=True)
+            .distinct()
+        )
+
+
+class MetricHourlyRollup(models.Model):
+    """Hourly pre-aggregated metrics used for trend queries"""
+
+    measurement = models.CharField(max_length=100, db_index=True)
+    tags = models.JSONField(default=dict, blank=True)
+    field = models.CharField(max_length=100)
+    bucket = models.DateTimeField(db_index=True, help_text='Start of the hour')
+
+    # Denormalized from tags like Metric, so trend filters stay on indexed columns
+    resource = models.CharField(max_length=50, null=True, blank=True)
+    entity_id = models.CharField(max_length=100, null=True, blank=True)
+    entity_name = models.CharField(max_length=255, null=True, blank=True)
+
+    # Aggregates are kept additive so buckets can be merged across fields
+    value_sum = models.FloatField(default=0)
+    value_count = models.IntegerField(default=0)
+    value_min = models.FloatField(default=0)
+    value_max = models.FloatField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['bucket']
+        indexes = [
+            models.Index(fields=['measurement', 'bucket']),
+            models.Index(fields=['measurement', 'resource', 'bucket']),
+            models.Index(fields=['measurement', 'entity_id', 'bucket']),
+        ]
+
+    def __str__(self):
+        return f"{self.measurement}.{self.field} - {self.bucket}"
+
 
 class Dashboard(models.Model):
     """Custom dashboard configurations"""
@@ -2,12 +2,18 @@ from django import template
 
 register = template.Library()
 
-@register.filter
+_NUMERIC_TYPES = (int, float)
+
+@register.filter(is_safe=True)
 def multiply(value, factor):
     """
     Multiply the given value by the factor.
     Usage: {{ value|multiply:factor }}
     """
+    # Float values need no conversion; the result is already a float
+    if type(value) is float and type(factor) in _NUMERIC_TYPES:
+        return value * factor
+
     try:
         return float(value) * float(factor)
     except (ValueError, TypeError):
@@ -1,3 +1,54 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from .analytics import AnalyticsEngine
+from .models import Metric
+
+
+class DistinctEntityIdsTests(TestCase):
+    """Entity lookups must see both backfilled and pre-upgrade metric rows"""
+
+    def setUp(self):
+        now = timezone.now()
+        # Written through from_point, so entity_id is filled in
+        Metric.from_point(
+            'service_replicas', {'service_id': 'svc-new'}, {'replicas_running': 1}, now
+        ).save()
+        # Stored before the tag columns existed: only the JSON tag is set
+        Metric.objects.create(
+            measurement='service_replicas',
+            tags={'service_id': 'svc-old'},
+            fields={'replicas_running': 1},
+            timestamp=now,
+        )
+        # Same service under both layouts is reported once
+        Metric.objects.create(
+            measurement='service_replicas',
+            tags={'service_id': 'svc-new'},
+            fields={'replicas_running': 1},
+            timestamp=now,
+        )
+        Metric.from_point('node_resources', {'node_id': 'node-1'}, {'cpu_cores': 4}, now).save()
+        self.start = now - timedelta(hours=1)
+        self.end = now + timedelta(hours=1)
+
+    def test_distinct_entity_ids_reads_column_and_json_tag(self):
+        ids = Metric.distinct_entity_ids(
+            Metric.objects.filter(measurement='service_replicas'), 'service_id'
+        )
+        self.assertEqual(sorted(ids), ['svc-new', 'svc-old'])
+
+    def test_unique_services_and_nodes(self):
+        engine = AnalyticsEngine()
+        self.assertEqual(
+            sorted(engine._get_unique_services(self.start, self.end)), ['svc-new', 'svc-old']
+        )
+        self.assertEqual(engine._get_unique_nodes(self.start, self.end), ['node-1'])
 
-# Create your tests here.
+    def test_filter_by_tags_matches_rows_without_columns(self):
+        queryset = Metric.filter_by_tags(
+            Metric.objects.filter(measurement='service_replicas'), {'service_id': 'svc-old'}
+        )
+        self.assertEqual(queryset.count(), 1)
@@ -2,8 +2,14 @@
 Dashboard views for Docker Swarm management
 """
 
+import asyncio
+import hashlib
 import json
+import logging
 import subprocess
+from contextlib import closing
+
+import yaml
 from django.utils import timezone
 
 from accounts.decorators import (
@@ -12,18 +18,47 @@ from accounts.decorators import (
     role_required,
     service_permission_required,
 )
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
-from django.shortcuts import redirect, render
+from django.contrib.auth.views import redirect_to_login
+from django.db.models import Count
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_POST
 from django.views.generic import TemplateView
 
-from .compose_utils import ComposeImporter, get_popular_compose_repositories
-from .docker_utils import DockerSwarmManager
+from .compose_utils import ComposeImporter, dump_yaml, get_popular_compose_repositories, load_yaml
+from .concurrency_utils import async_view, map_in_parallel, submit_background
+from .docker_utils import build_log_filter, get_docker_manager, invalidate_list_cache
+from .json_utils import FastJsonResponse, dumps, loads
+from .models import ComposeImportDraft, ComposeStack, ServiceGroup
+
+logger = logging.getLogger(__name__)
+
+# Seconds a browser may reuse a polled API response before revalidating;
+# kept under the server-side list cache TTL
+API_CACHE_MAX_AGE = 2
+
+# Upper bound on log lines a single request may ask Docker for
+MAX_LOG_LINES = 10000
+
+# A live log stream ends after this long and the browser's EventSource
+# reconnects, so streams whose client left unnoticed don't hold a Docker
+# connection open indefinitely
+LOG_STREAM_MAX_SECONDS = 300
+
+# Quiet streams send an SSE comment this often to keep proxies from timing out
+LOG_STREAM_KEEPALIVE_SECONDS = 15
+
+# Concurrent service creates when deploying a reviewed compose import; well
+# under the Docker client's connection pool so the daemon isn't flooded
+COMPOSE_DEPLOY_WORKERS = 8
 
 
 class DashboardView(LoginRequiredMixin, TemplateView):
@@ -31,18 +66,11 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        docker_manager = DockerSwarmManager()
+        docker_manager = get_docker_manager()
 
-        context.update(
-            {
-                "swarm_active": docker_manager.is_swarm_active(),
-                "swarm_info": docker_manager.get_swarm_info(),
-                "system_info": docker_manager.get_system_info(),
-                "cluster_resources": docker_manager.get_cluster_resources(),
-                "nodes": docker_manager.get_nodes(),
-                "services": docker_manager.get_services(),
-            }
-        )
+        context.update(docker_manager.get_dashboard_bundle())
+        # Served from the node and service lists the bundle just cached
+        context["cluster_resources"] = docker_manager.get_cluster_resources()
 
         return context
 
@@ -50,7 +78,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 @login_required
 def services_view(request):
     """Services management view"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
 
     context = {
         "services": docker_manager.get_services(),
@@ -62,7 +90,7 @@ def services_view(request):
 
 def nodes_view(request):
     """Nodes management view"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
 
     context = {
         "nodes": docker_manager.get_nodes(),
@@ -74,12 +102,11 @@ def nodes_view(request):
 
 def service_detail_view(request, service_id):
     """Service detail view"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
     service_details = docker_manager.get_service_details(service_id)
 
     if not service_details:
-        messages.error(request, "Service not found")
-        return redirect("services")
+        raise Http404("Service not found")
 
     context = {
         "service": service_details["service"],
@@ -89,148 +116,205 @@ def service_detail_view(request, service_id):
     return render(request, "dashboard/service_detail.html", context)
 
 
+@async_view
 @csrf_exempt
-@require_http_methods(["POST"])
+@require_POST
 def restart_service(request, service_id):
     """Restart a service"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
 
     if docker_manager.restart_service(service_id):
-        return JsonResponse(
+        return FastJsonResponse(
             {"status": "success", "message": "Service restarted successfully"}
         )
     else:
-        return JsonResponse(
+        return FastJsonResponse(
             {"status": "error", "message": "Failed to restart service"}, status=500
         )
 
 
+def _json_object_body(request):
+    """Decode the request body as a JSON object, or None if it isn't one"""
+    try:
+        data = loads(request.body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _requested_replicas(data):
+    """Validate the optional ``replicas`` field as a non-negative integer"""
+    replicas = data.get("replicas", 1)
+    if isinstance(replicas, str) and replicas.isdigit():
+        return int(replicas)
+    if type(replicas) is int and replicas >= 0:
+        return replicas
+    return None
+
+
+def _invalid_request_response():
+    """400 response for a malformed JSON request body"""
+    return FastJsonResponse(
+        {"status": "error", "message": "Invalid request data"}, status=400
+    )
+
+
+@async_view
 @csrf_exempt
-@require_http_methods(["POST"])
+@require_POST
 def scale_service(request, service_id):
     """Scale a service"""
-    try:
-        data = json.loads(request.body)
-        replicas = int(data.get("replicas", 1))
+    data = _json_object_body(request)
+    replicas = _requested_replicas(data) if data is not None else None
+    if replicas is None:
+        return _invalid_request_response()
 
-        docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
 
-        if docker_manager.scale_service(service_id, replicas):
-            return JsonResponse(
-                {
-                    "status": "success",
-                    "message": f"Service scaled to {replicas} replicas",
-                }
-            )
-        else:
-            return JsonResponse(
-                {"status": "error", "message": "Failed to scale service"}, status=500
-            )
-    except (ValueError, KeyError) as e:
-        return JsonResponse(
-            {"status": "error", "message": "Invalid request data"}, status=400
+    if docker_manager.scale_service(service_id, replicas):
+        return FastJsonResponse(
+            {
+                "status": "success",
+                "message": f"Service scaled to {replicas} replicas",
+            }
+        )
+    else:
+        return FastJsonResponse(
+            {"status": "error", "message": "Failed to scale service"}, status=500
         )
 
 
+@async_view
 @csrf_exempt
-@require_http_methods(["POST"])
+@require_POST
 def remove_service(request, service_id):
     """Remove a service"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
 
     if docker_manager.remove_service(service_id):
-        return JsonResponse(
+        return FastJsonResponse(
             {"status": "success", "message": "Service removed successfully"}
         )
     else:
-        return JsonResponse(
+        return FastJsonResponse(
             {"status": "error", "message": "Failed to remove service"}, status=500
         )
 
 
+@async_view
 @csrf_exempt
-@require_http_methods(["POST"])
+@require_POST
 def create_service(request):
     """Create a new service"""
-    try:
-        data = json.loads(request.body)
+    data = _json_object_body(request)
+    replicas = _requested_replicas(data) if data is not None else None
+    if replicas is None:
+        return _invalid_request_response()
+
+    image = data.get("image")
+    name = data.get("name")
+
+    if not image or not name:
+        return FastJsonResponse(
+            {"status": "error", "message": "Image and name are required"},
+            status=400,
+        )
 
-        image = data.get("image")
-        name = data.get("name")
-        replicas = int(data.get("replicas", 1))
+    docker_manager = get_docker_manager()
 
-        if not image or not name:
-            return JsonResponse(
-                {"status": "error", "message": "Image and name are required"},
-                status=400,
-            )
+    # Prepare additional arguments
+    kwargs = {}
+    if data.get("ports"):
+        kwargs["ports"] = data["ports"]
+    if data.get("env"):
+        kwargs["env"] = data["env"]
+    if data.get("labels"):
+        kwargs["labels"] = data["labels"]
 
-        docker_manager = DockerSwarmManager()
+    if docker_manager.create_service(image, name, replicas, **kwargs):
+        return FastJsonResponse(
+            {"status": "success", "message": "Service created successfully"}
+        )
+    else:
+        return FastJsonResponse(
+            {"status": "error", "message": "Failed to create service"}, status=500
+        )
 
-        # Prepare additional arguments
-        kwargs = {}
-        if data.get("ports"):
-            kwargs["ports"] = data["ports"]
-        if data.get("env"):
-            kwargs["env"] = data["env"]
-        if data.get("labels"):
-            kwargs["labels"] = data["labels"]
 
-        if docker_manager.create_service(image, name, replicas, **kwargs):
-            return JsonResponse(
-                {"status": "success", "message": "Service created successfully"}
-            )
-        else:
-            return JsonResponse(
-                {"status": "error", "message": "Failed to create service"}, status=500
-            )
-    except (ValueError, KeyError) as e:
-        return JsonResponse(
-            {"status": "error", "message": "Invalid request data"}, status=400
+def _conditional_json_response(request, data, etag=None, body=None):
+    """JSON response that answers a matching If-None-Match with 304 Not Modified"""
+    if not etag:
+        body = dumps(data)
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    etag = quote_etag(etag)
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(
+            body if body is not None else dumps(data), content_type="application/json"
         )
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, max_age=API_CACHE_MAX_AGE)
+    return response
 
 
+def _list_json_response(request, docker_manager, key, items):
+    """Serve a Docker list as ``{key: [...]}``, reusing its cached JSON bytes"""
+    cached = docker_manager.cached_list_json(key) if items else None
+    if cached is None:
+        return _conditional_json_response(request, {key: items})
+
+    etag, body = cached
+    return _conditional_json_response(
+        request, None, etag, body=b'{"%s":%s}' % (key.encode(), body)
+    )
+
+
+@async_view
 def api_services(request):
     """API endpoint for services data"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
     services = docker_manager.get_services()
-    return JsonResponse({"services": services})
+    return _list_json_response(request, docker_manager, "services", services)
 
 
+@async_view
 def api_nodes(request):
     """API endpoint for nodes data"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
     nodes = docker_manager.get_nodes()
-    return JsonResponse({"nodes": nodes})
+    return _list_json_response(request, docker_manager, "nodes", nodes)
 
 
+@async_view
 def api_system_info(request):
     """API endpoint for system information"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
     system_info = docker_manager.get_system_info()
     swarm_info = docker_manager.get_swarm_info()
 
-    return JsonResponse(
+    return _conditional_json_response(
+        request,
         {
             "system_info": system_info,
             "swarm_info": swarm_info,
             "swarm_active": docker_manager.is_swarm_active(),
-        }
+        },
     )
 
 
 def api_cluster_resources(request):
     """API endpoint for cluster resources"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
     cluster_resources = docker_manager.get_cluster_resources()
-    return JsonResponse(cluster_resources)
+    return FastJsonResponse(cluster_resources)
 
 
 def api_cluster_stats(request):
     """API endpoint for real-time cluster statistics"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
     cluster_stats = docker_manager.get_cluster_stats()
-    return JsonResponse(cluster_stats)
+    return FastJsonResponse(cluster_stats)
 
 
 def create_service_view(request):
@@ -245,26 +329,27 @@ def create_service_view(request):
                 messages.error(request, "Image and name are required")
                 return render(request, "dashboard/create_service.html")
 
-            docker_manager = DockerSwarmManager()
-
             # Prepare additional arguments
             kwargs = {}
-            if request.POST.get("ports"):
+            ports = request.POST.get("ports")
+            if ports:
                 try:
-                    ports = json.loads(request.POST.get("ports"))
-                    kwargs["ports"] = ports
+                    kwargs["ports"] = loads(ports)
                 except json.JSONDecodeError:
                     pass
 
-            if request.POST.get("env"):
-                env_vars = {}
-                for line in request.POST.get("env").split("\n"):
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        env_vars[key.strip()] = value.strip()
+            env = request.POST.get("env")
+            if env:
+                env_vars = {
+                    key.strip(): value.strip()
+                    for key, sep, value in (line.partition("=") for line in env.splitlines())
+                    if sep
+                }
                 if env_vars:
                     kwargs["env"] = env_vars
 
+            # Only reach for Docker once the form has been fully parsed
+            docker_manager = get_docker_manager()
             if docker_manager.create_service(image, name, replicas, **kwargs):
                 messages.success(request, f'Service "{name}" created successfully')
                 return redirect("services")
@@ -278,70 +363,91 @@ def create_service_view(request):
     return render(request, "dashboard/create_service.html")
 
 
-@login_required
-def import_compose_view(request):
-    """Import Docker Compose from Git repository"""
-    popular_repos = get_popular_compose_repositories()
+def _get_compose_import(request):
+    """Load the current user's pending compose import, if any"""
+    # The session only carries the draft id, not the parsed services
+    draft_id = request.session.get("compose_import")
+    if not draft_id:
+        return None
+    return ComposeImportDraft.objects.filter(id=draft_id, user=request.user).first()
 
-    if request.method == "POST":
-        try:
-            repo_url = request.POST.get("repo_url", "").strip()
-            branch = request.POST.get("branch", "main").strip()
-            compose_file_path = (
-                request.POST.get("compose_file_path", "").strip() or None
-            )
 
-            if not repo_url:
-                messages.error(request, "Repository URL is required")
-                return render(
-                    request,
-                    "dashboard/import_compose.html",
-                    {"popular_repos": popular_repos},
-                )
+def _clear_compose_import(request):
+    """Drop the current user's pending compose import"""
+    draft_id = request.session.pop("compose_import", None)
+    if draft_id:
+        ComposeImportDraft.objects.filter(id=draft_id, user=request.user).delete()
 
-            # Import compose services
-            with ComposeImporter() as importer:
-                services, metadata = importer.import_from_git(
-                    repo_url, branch, compose_file_path
-                )
 
-            # Store in session for review
-            request.session["compose_import"] = {
-                "services": services,
-                "metadata": metadata,
-            }
+def _compose_import_error_message(error, repo_url):
+    """User-facing message for a failed compose import"""
+    if isinstance(error, FileNotFoundError):
+        if "No Docker Compose files found" in str(error):
+            return "No Docker Compose files found in the repository. Make sure the repository contains docker-compose.yml or docker-compose.yaml files."
+        return f"File not found: {str(error)}"
+    if isinstance(error, RuntimeError):
+        if "Failed to clone repository" in str(error):
+            return f"Unable to clone repository. Please check the URL and ensure it's a valid Git repository. {str(error)}"
+        return f"Repository error: {str(error)}"
+    if isinstance(error, ValueError):
+        return f"Invalid compose file format: {str(error)}"
 
-            return redirect("dashboard:review_compose_import")
+    logger.error(f"Unexpected error importing compose file from {repo_url}: {error}")
+    return f"Unexpected error importing compose file: {str(error)}"
 
-        except FileNotFoundError as e:
-            if "No Docker Compose files found" in str(e):
-                messages.error(
-                    request,
-                    "No Docker Compose files found in the repository. Make sure the repository contains docker-compose.yml or docker-compose.yaml files.",
-                )
-            else:
-                messages.error(request, f"File not found: {str(e)}")
-        except RuntimeError as e:
-            if "Failed to clone repository" in str(e):
-                messages.error(
-                    request,
-                    f"Unable to clone repository. Please check the URL and ensure it's a valid Git repository. {str(e)}",
-                )
-            else:
-                messages.error(request, f"Repository error: {str(e)}")
-        except ValueError as e:
-            messages.error(request, f"Invalid compose file format: {str(e)}")
-        except Exception as e:
-            import logging
 
-            logger = logging.getLogger(__name__)
-            logger.error(
-                f"Unexpected error importing compose file from {repo_url}: {e}"
+def _run_compose_import(draft_id, repo_url, branch, compose_file_path):
+    """Clone and convert a compose import off the request thread, recording the outcome on its draft"""
+    drafts = ComposeImportDraft.objects.filter(id=draft_id)
+    try:
+        with ComposeImporter() as importer:
+            services, metadata = importer.import_from_git(
+                repo_url, branch, compose_file_path
             )
-            messages.error(
-                request, f"Unexpected error importing compose file: {str(e)}"
+    except Exception as e:
+        drafts.update(
+            status=ComposeImportDraft.FAILED,
+            error=_compose_import_error_message(e, repo_url),
+        )
+        return
+
+    drafts.update(status=ComposeImportDraft.READY, services=services, metadata=metadata)
+
+
+@login_required
+def import_compose_view(request):
+    """Import Docker Compose from Git repository"""
+    popular_repos = get_popular_compose_repositories()
+
+    if request.method == "POST":
+        repo_url = request.POST.get("repo_url", "").strip()
+        branch = request.POST.get("branch", "main").strip()
+        compose_file_path = (
+            request.POST.get("compose_file_path", "").strip() or None
+        )
+
+        if not repo_url:
+            messages.error(request, "Repository URL is required")
+            return render(
+                request,
+                "dashboard/import_compose.html",
+                {"popular_repos": popular_repos},
             )
 
+        # Record a pending draft, replacing any earlier import, and clone in
+        # the background so the request doesn't wait on git
+        _clear_compose_import(request)
+        ComposeImportDraft.cleanup_old_drafts()
+        draft = ComposeImportDraft.objects.create(
+            user=request.user,
+            status=ComposeImportDraft.PENDING,
+            metadata={"repository_url": repo_url, "branch": branch},
+        )
+        request.session["compose_import"] = draft.id
+        submit_background(_run_compose_import, draft.id, repo_url, branch, compose_file_path)
+
+        return redirect("dashboard:review_compose_import")
+
     context = {"popular_repos": popular_repos}
 
     return render(request, "dashboard/import_compose.html", context)
@@ -350,21 +456,32 @@ def import_compose_view(request):
 @login_required
 def review_compose_import_view(request):
     """Review imported compose services before deployment"""
-    compose_data = request.session.get("compose_import")
+    draft = _get_compose_import(request)
 
-    if not compose_data:
+    if not draft:
         messages.error(
             request, "No compose data found. Please import a compose file first."
         )
         return redirect("dashboard:import_compose")
 
-    services = compose_data["services"]
-    metadata = compose_data["metadata"]
+    if draft.status == draft.PENDING:
+        # The page refreshes itself until the background import finishes
+        return render(
+            request, "dashboard/compose_import_processing.html", {"metadata": draft.metadata}
+        )
+
+    if draft.status == draft.FAILED:
+        messages.error(request, draft.error)
+        _clear_compose_import(request)
+        return redirect("dashboard:import_compose")
+
+    services = draft.services
+    metadata = draft.metadata
 
     if request.method == "POST":
         try:
             selected_services = request.POST.getlist("selected_services")
-            docker_manager = DockerSwarmManager()
+            docker_manager = get_docker_manager()
 
             if not selected_services:
                 messages.error(request, "Please select at least one service to deploy")
@@ -374,32 +491,45 @@ def review_compose_import_view(request):
                     {"services": services, "metadata": metadata},
                 )
 
-            deployed_count = 0
+            def deploy(service_data):
+                """Deploy one service, returning None on success or its failure label"""
+                try:
+                    success = docker_manager.create_service(
+                        image=service_data["image"],
+                        name=service_data["name"],
+                        replicas=service_data.get("replicas", 1),
+                        env=service_data.get("environment", {}),
+                        ports=service_data.get("ports", []),
+                        labels=service_data.get("labels", {}),
+                    )
+                    return None if success else service_data["name"]
+                except Exception as e:
+                    return f"{service_data['name']} ({str(e)})"
+
+            # Services missing required fields would only fail at the daemon;
+            # reject them up front and deploy the rest
+            selected = set(selected_services)
+            importer = ComposeImporter()
+            deployable = []
             failed_services = []
+            for service in services:
+                if service["name"] not in selected:
+                    continue
+                errors = importer.required_field_errors(service)
+                if errors:
+                    failed_services.append(f"{service['name']} ({'; '.join(errors)})")
+                else:
+                    deployable.append(service)
+
+            # Each create is an independent Docker API round-trip
+            results = map_in_parallel(
+                deploy, deployable, max_workers=COMPOSE_DEPLOY_WORKERS
+            )
+            failed_services.extend(label for label in results if label is not None)
+            deployed_count = results.count(None)
 
-            for service_data in services:
-                if service_data["name"] in selected_services:
-                    try:
-                        # Deploy service
-                        success = docker_manager.create_service(
-                            image=service_data["image"],
-                            name=service_data["name"],
-                            replicas=service_data.get("replicas", 1),
-                            env=service_data.get("environment", {}),
-                            ports=service_data.get("ports", []),
-                            labels=service_data.get("labels", {}),
-                        )
-
-                        if success:
-                            deployed_count += 1
-                        else:
-                            failed_services.append(service_data["name"])
-
-                    except Exception as e:
-                        failed_services.append(f"{service_data['name']} ({str(e)})")
-
-            # Clear session data
-            del request.session["compose_import"]
+            # Clear import draft
+            _clear_compose_import(request)
 
             if deployed_count > 0:
                 messages.success(
@@ -416,10 +546,11 @@ def review_compose_import_view(request):
         except Exception as e:
             messages.error(request, f"Error during deployment: {str(e)}")
 
-    # Add validation warnings for each service
+    # Add validation warnings for each service; validation needs no temp
+    # directory, so the importer is not entered as a context manager
+    warnings = ComposeImporter().validate_services(services)
     for service in services:
-        with ComposeImporter() as importer:
-            service["warnings"] = importer.validate_service_for_swarm(service)
+        service["warnings"] = warnings[service.get("name")]
 
     context = {"services": services, "metadata": metadata}
 
@@ -429,31 +560,45 @@ def review_compose_import_view(request):
 @login_required
 def clear_compose_import_view(request):
     """Clear compose import session data"""
-    if "compose_import" in request.session:
-        del request.session["compose_import"]
+    _clear_compose_import(request)
 
     messages.info(request, "Compose import data cleared")
     return redirect("import_compose")
 
 
+def _requested_log_lines(request, default):
+    """Read the ``lines`` query parameter, clamped to 0..MAX_LOG_LINES"""
+    try:
+        lines = int(request.GET.get('lines', default))
+    except ValueError:
+        lines = default
+    return max(0, min(lines, MAX_LOG_LINES))
+
+
+def _requested_log_filter(request):
+    """Build the log line filter from the ``level`` and ``search`` query parameters"""
+    return build_log_filter(request.GET.get('level', ''), request.GET.get('search', ''))
+
+
 @login_required
 def service_logs_view(request, service_id):
     """View logs for a specific service"""
-    from django.shortcuts import get_object_or_404
+    docker_manager = get_docker_manager()
 
-    docker_manager = DockerSwarmManager()
-
-    lines = int(request.GET.get('lines', 100))
+    lines = _requested_log_lines(request, 100)
     since = request.GET.get('since', '')
+    level = request.GET.get('level', '')
+    search = request.GET.get('search', '')
 
     # Get service details
     service_details = docker_manager.get_service_details(service_id)
     if not service_details:
-        messages.error(request, "Service not found")
-        return redirect('services')
+        raise Http404("Service not found")
 
     # Get service logs
-    logs_data = docker_manager.get_service_logs(service_id, lines=lines, since=since or None)
+    logs_data = docker_manager.get_service_logs(
+        service_id, lines=lines, since=since or None, line_filter=build_log_filter(level, search)
+    )
 
     # Get service tasks with containers
     tasks = docker_manager.get_service_tasks_with_containers(service_id)
@@ -465,6 +610,8 @@ def service_logs_view(request, service_id):
         'tasks': tasks,
         'lines_requested': lines,
         'since_requested': since,
+        'level_requested': level,
+        'search_requested': search,
     }
 
     return render(request, 'dashboard/service_logs.html', context)
@@ -473,35 +620,108 @@ def service_logs_view(request, service_id):
 @login_required
 def api_service_logs(request, service_id):
     """API endpoint for service logs"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
 
-    lines = int(request.GET.get('lines', 100))
+    lines = _requested_log_lines(request, 100)
     since = request.GET.get('since', '')
+    line_filter = _requested_log_filter(request)
+
+    # NDJSON clients get lines as Docker reads them instead of one buffered list
+    if request.GET.get('format') == 'ndjson':
+        def ndjson_lines():
+            try:
+                with closing(docker_manager.stream_service_logs(
+                    service_id, tail=lines, line_filter=line_filter, follow=False, since=since or None
+                )) as log_lines:
+                    for line in log_lines:
+                        yield dumps({"line": line}) + b"\n"
+            except Exception as e:
+                yield dumps({"error": str(e)}) + b"\n"
+
+        return StreamingHttpResponse(ndjson_lines(), content_type='application/x-ndjson')
+
+    logs_data = docker_manager.get_service_logs(
+        service_id, lines=lines, since=since or None, line_filter=line_filter
+    )
+
+    return FastJsonResponse(logs_data)
 
-    logs_data = docker_manager.get_service_logs(service_id, lines=lines, since=since or None)
 
-    return JsonResponse(logs_data)
+async def api_service_logs_stream(request, service_id):
+    """Stream service logs to the browser as Server-Sent Events"""
+    # login_required can't wrap async views on this Django version
+    if not await sync_to_async(lambda: request.user.is_authenticated)():
+        return redirect_to_login(request.get_full_path())
+
+    lines = _requested_log_lines(request, 0)
+    line_filter = _requested_log_filter(request)
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + LOG_STREAM_MAX_SECONDS
+        log_lines = None
+        pending = None
+        try:
+            docker_manager = await sync_to_async(get_docker_manager, thread_sensitive=False)()
+            log_lines = await sync_to_async(docker_manager.stream_service_logs, thread_sensitive=False)(
+                service_id, tail=lines, line_filter=line_filter
+            )
+            while (remaining := deadline - loop.time()) > 0:
+                # Each blocking read runs in a worker thread; a read still
+                # pending after a keepalive is awaited again, never restarted
+                if pending is None:
+                    pending = asyncio.ensure_future(
+                        sync_to_async(next, thread_sensitive=False)(log_lines, None)
+                    )
+                done, _ = await asyncio.wait({pending}, timeout=min(LOG_STREAM_KEEPALIVE_SECONDS, remaining))
+                if not done:
+                    yield ": keepalive\n\n"
+                    continue
+
+                line = pending.result()
+                pending = None
+                if line is None:
+                    break
+                yield f"data: {line}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {e}\n\n"
+        finally:
+            # Closing the Docker connection unblocks a read left in its thread
+            if log_lines is not None:
+                log_lines.close()
+            if pending is not None:
+                pending.cancel()
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @login_required
 def api_container_logs(request, container_id):
     """API endpoint for container logs"""
-    docker_manager = DockerSwarmManager()
+    docker_manager = get_docker_manager()
 
-    lines = int(request.GET.get('lines', 100))
+    lines = _requested_log_lines(request, 100)
     since = request.GET.get('since', '')
+    line_filter = _requested_log_filter(request)
 
-    logs_data = docker_manager.get_container_logs(container_id, lines=lines, since=since or None)
+    logs_data = docker_manager.get_container_logs(
+        container_id, lines=lines, since=since or None, line_filter=line_filter
+    )
 
-    return JsonResponse(logs_data)
+    return FastJsonResponse(logs_data)
 
 
 @login_required
 def service_groups_view(request):
     """Manage service groups"""
-    from .models import ServiceGroup
-
-    groups = ServiceGroup.objects.all()
+    # Count every group's services in the same query as the groups
+    groups = ServiceGroup.objects.select_related('created_by').annotate(
+        services_count=Count('service_group_mappings')
+    )
 
     context = {
         'groups': groups,
@@ -513,9 +733,6 @@ def service_groups_view(request):
 @login_required
 def stacks_view(request):
     """View and manage Docker Compose stacks"""
-    from .models import ComposeStack
-    import yaml
-
     if request.method == 'POST':
         stack_name = request.POST.get('name', '').strip()
         description = request.POST.get('description', '').strip()
@@ -528,7 +745,7 @@ def stacks_view(request):
         else:
             try:
                 # Validate YAML content
-                yaml.safe_load(compose_content)
+                load_yaml(compose_content)
                 
                 # Create stack
                 stack = ComposeStack.objects.create(
@@ -549,7 +766,13 @@ def stacks_view(request):
             except Exception as e:
                 messages.error(request, f'Error creating stack: {str(e)}')
 
-    stacks = ComposeStack.objects.all().order_by('-created_at')
+    # Join the user each stack row shows instead of fetching it per row, and
+    # leave the compose content columns out of the list query
+    stacks = ComposeStack.objects.select_related('created_by').only(
+        'id', 'name', 'description', 'status', 'created_at', 'last_deployed',
+        'services_count', 'networks_list', 'volumes_list', 'source_repository',
+        'created_by__username',
+    ).order_by('-created_at')
 
     context = {
         'stacks': stacks,
@@ -558,18 +781,50 @@ def stacks_view(request):
     return render(request, 'dashboard/stacks.html', context)
 
 
+def _compose_service_config(service):
+    """Convert an imported service back to its compose file entry"""
+    config = {'image': service['image']}
+
+    replicas = service.get('replicas', 1)
+    if replicas != 1:
+        config['deploy'] = {'replicas': replicas}
+
+    ports = service.get('ports')
+    if ports:
+        config['ports'] = [
+            f"{port['published_port']}:{port['target_port']}"
+            for port in ports
+            if port.get('published_port') and port.get('target_port')
+        ]
+
+    environment = service.get('environment')
+    if environment:
+        config['environment'] = environment
+
+    volumes = service.get('volumes')
+    if volumes:
+        config['volumes'] = [f"{vol['source']}:{vol['target']}" for vol in volumes]
+
+    networks = service.get('networks')
+    if networks:
+        config['networks'] = networks
+
+    return config
+
+
 @login_required
 def save_compose_as_stack_view(request):
     """Save imported compose data as an editable stack"""
-    from .models import ComposeStack
-    import yaml
-
-    compose_data = request.session.get('compose_import')
+    draft = _get_compose_import(request)
 
-    if not compose_data:
+    if not draft:
         messages.error(request, 'No compose data found. Please import a compose file first.')
         return redirect('dashboard:import_compose')
 
+    # Pending and failed imports are handled by the review page
+    if draft.status != draft.READY:
+        return redirect('dashboard:review_compose_import')
+
     if request.method == 'POST':
         stack_name = request.POST.get('stack_name', '').strip()
         description = request.POST.get('description', '').strip()
@@ -577,38 +832,14 @@ def save_compose_as_stack_view(request):
         if not stack_name:
             messages.error(request, 'Stack name is required')
             return render(request, 'dashboard/save_compose_stack.html', {
-                'metadata': compose_data['metadata']
+                'metadata': draft.metadata
             })
 
         try:
             # Convert services back to compose format
-            services_dict = {}
-            for service in compose_data['services']:
-                service_config = {
-                    'image': service['image'],
-                }
-
-                if service.get('replicas', 1) != 1:
-                    service_config['deploy'] = {'replicas': service['replicas']}
-
-                if service.get('ports'):
-                    service_config['ports'] = []
-                    for port in service['ports']:
-                        if port.get('published_port') and port.get('target_port'):
-                            service_config['ports'].append(f"{port['published_port']}:{port['target_port']}")
-
-                if service.get('environment'):
-                    service_config['environment'] = service['environment']
-
-                if service.get('volumes'):
-                    service_config['volumes'] = []
-                    for vol in service['volumes']:
-                        service_config['volumes'].append(f"{vol['source']}:{vol['target']}")
-
-                if service.get('networks'):
-                    service_config['networks'] = service['networks']
-
-                services_dict[service['name']] = service_config
+            services_dict = {
+                service['name']: _compose_service_config(service) for service in draft.services
+            }
 
             # Build complete compose structure
             compose_structure = {
@@ -616,33 +847,33 @@ def save_compose_as_stack_view(request):
                 'services': services_dict
             }
 
-            if compose_data['metadata'].get('networks'):
+            if draft.metadata.get('networks'):
                 compose_structure['networks'] = {
-                    net: {} for net in compose_data['metadata']['networks']
+                    net: {} for net in draft.metadata['networks']
                 }
 
-            if compose_data['metadata'].get('volumes'):
+            if draft.metadata.get('volumes'):
                 compose_structure['volumes'] = {
-                    vol: {} for vol in compose_data['metadata']['volumes']
+                    vol: {} for vol in draft.metadata['volumes']
                 }
 
             # Convert to YAML
-            compose_yaml = yaml.dump(compose_structure, default_flow_style=False, sort_keys=False)
+            compose_yaml = dump_yaml(compose_structure, default_flow_style=False, sort_keys=False)
 
             # Create stack
             stack = ComposeStack.objects.create(
                 name=stack_name,
                 description=description,
                 compose_content=compose_yaml,
-                source_repository=compose_data['metadata'].get('repository_url', ''),
-                source_branch=compose_data['metadata'].get('branch', ''),
+                source_repository=draft.metadata.get('repository_url', ''),
+                source_branch=draft.metadata.get('branch', ''),
                 created_by=request.user
             )
 
             stack.update_metadata()
 
-            # Clear session data
-            del request.session['compose_import']
+            # Clear import draft
+            _clear_compose_import(request)
 
             messages.success(request, f'Stack "{stack_name}" saved successfully')
             return redirect('dashboard:stacks')
@@ -651,8 +882,8 @@ def save_compose_as_stack_view(request):
             messages.error(request, f'Error saving stack: {str(e)}')
 
     context = {
-        'metadata': compose_data['metadata'],
-        'services_count': len(compose_data['services'])
+        'metadata': draft.metadata,
+        'services_count': len(draft.services)
     }
 
     return render(request, 'dashboard/save_compose_stack.html', context)
@@ -661,10 +892,7 @@ def save_compose_as_stack_view(request):
 @login_required
 def stack_detail_view(request, stack_id):
     """View stack details"""
-    from .models import ComposeStack
-    from django.shortcuts import get_object_or_404
-    
-    stack = get_object_or_404(ComposeStack, id=stack_id)
+    stack = get_object_or_404(ComposeStack.objects.select_related('created_by', 'deployed_by'), id=stack_id)
     
     context = {
         'stack': stack,
@@ -676,10 +904,6 @@ def stack_detail_view(request, stack_id):
 @login_required
 def stack_edit_view(request, stack_id):
     """Edit a stack"""
-    from .models import ComposeStack
-    from django.shortcuts import get_object_or_404
-    import yaml
-    
     stack = get_object_or_404(ComposeStack, id=stack_id)
     
     if request.method == 'POST':
@@ -694,7 +918,7 @@ def stack_edit_view(request, stack_id):
         else:
             try:
                 # Validate YAML content
-                yaml.safe_load(compose_content)
+                load_yaml(compose_content)
                 
                 # Update stack
                 stack.name = stack_name
@@ -723,40 +947,24 @@ def stack_edit_view(request, stack_id):
 @login_required
 def stack_deploy_view(request, stack_id):
     """Deploy a stack"""
-    from .models import ComposeStack
-    from django.shortcuts import get_object_or_404
-    import yaml
-    import tempfile
-    import subprocess
-    import os
-    
     stack = get_object_or_404(ComposeStack, id=stack_id)
     
     if request.method == 'POST':
         try:
-            # Create temporary compose file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as temp_file:
-                temp_file.write(stack.compose_content)
-                temp_file_path = temp_file.name
+            # Deploy using docker stack deploy, piping the compose file on stdin
+            result = subprocess.run([
+                'docker', 'stack', 'deploy', 
+                '--compose-file', '-',
+                stack.name
+            ], input=stack.compose_content, capture_output=True, text=True, check=True)
+            invalidate_list_cache()
             
-            try:
-                # Deploy using docker stack deploy
-                result = subprocess.run([
-                    'docker', 'stack', 'deploy', 
-                    '--compose-file', temp_file_path,
-                    stack.name
-                ], capture_output=True, text=True, check=True)
-                
-                # Update stack status
-                stack.status = 'deployed'
-                stack.last_deployed = timezone.now()
-                stack.save()
-                
-                messages.success(request, f'Stack "{stack.name}" deployed successfully')
-                
-            finally:
-                # Clean up temporary file
-                os.unlink(temp_file_path)
+            # Update stack status
+            stack.status = 'deployed'
+            stack.last_deployed = timezone.now()
+            stack.save()
+            
+            messages.success(request, f'Stack "{stack.name}" deployed successfully')
                 
         except subprocess.CalledProcessError as e:
             messages.error(request, f'Failed to deploy stack: {e.stderr}')
@@ -773,23 +981,16 @@ def stack_deploy_view(request, stack_id):
 @login_required
 def stack_delete_view(request, stack_id):
     """Delete a stack"""
-    from .models import ComposeStack
-    from django.shortcuts import get_object_or_404
-    
     stack = get_object_or_404(ComposeStack, id=stack_id)
     
     if request.method == 'POST':
         try:
             stack_name = stack.name
             
-            # Try to remove from Docker Swarm if deployed
+            # Try to remove from Docker Swarm if deployed; continue with
+            # deletion even if stack removal fails
             if stack.status == 'deployed':
-                try:
-                    subprocess.run(['docker', 'stack', 'rm', stack.name], 
-                                 capture_output=True, text=True, check=True)
-                except subprocess.CalledProcessError:
-                    # Continue with deletion even if stack removal fails
-                    pass
+                get_docker_manager().remove_stack(stack.name)
             
             # Delete from database
             stack.delete()
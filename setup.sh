@@ -86,6 +86,9 @@ fi
 echo "🗃️ Setting up database..."
 python manage.py migrate
 
+# Fill indexed tag columns on metrics stored by earlier versions
+python manage.py backfill_metric_tags
+
 # Create static files directory
 echo "📁 Setting up static files..."
 python manage.py collectstatic --noinput
@@ -112,7 +115,7 @@ Type=simple
 User=$USER
 WorkingDirectory=$(pwd)
 Environment=PATH=$(pwd)/venv/bin:/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin
-ExecStart=$(pwd)/venv/bin/python manage.py runserver 0.0.0.0:8000
+ExecStart=$(pwd)/venv/bin/gunicorn swarm_manager.asgi:application -k uvicorn.workers.UvicornWorker --workers 2 --bind 0.0.0.0:8000
 Restart=always
 RestartSec=3
 
@@ -4,16 +4,37 @@ ASGI config for swarm_manager project.
 
 import os
 
-from channels.auth import AuthMiddlewareStack
-from channels.routing import ProtocolTypeRouter, URLRouter
-from dashboard import routing
+from asgiref.sync import sync_to_async
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "swarm_manager.settings")
 
+# Set up Django before importing anything that touches apps or models
+django_asgi_app = get_asgi_application()
+
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from dashboard import routing  # noqa: E402
+from dashboard.docker_utils import get_docker_manager  # noqa: E402
+
+
+async def lifespan(scope, receive, send):
+    """Connect to Docker and start its event watcher when the server boots"""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            # Connecting blocks on the socket, so keep it off the event loop
+            await sync_to_async(get_docker_manager, thread_sensitive=False)()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
 application = ProtocolTypeRouter(
     {
-        "http": get_asgi_application(),
+        "http": django_asgi_app,
         "websocket": AuthMiddlewareStack(URLRouter(routing.websocket_urlpatterns)),
+        "lifespan": lifespan,
     }
 )
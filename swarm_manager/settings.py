@@ -107,6 +107,22 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
+# Cache: shared Redis cache when REDIS_CACHE_URL is set, per-process memory otherwise
+REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL")
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # Channel Layers
 CHANNEL_LAYERS = {
     "default": {
@@ -228,6 +244,10 @@ LOGGING = {
     },
 }
 
+# Parse compose files with rapidyaml when it is installed; anything it can't
+# map exactly still falls back to PyYAML
+FAST_YAML = os.getenv("FAST_YAML", "False").lower() == "true"
+
 # Docker Settings
 DOCKER_HOST = os.getenv("DOCKER_HOST", "unix://var/run/docker.sock")
 DOCKER_TLS_VERIFY = os.getenv("DOCKER_TLS_VERIFY", False)
@@ -2,71 +2,115 @@
 Version management for Docker Swarm Manager
 """
 
+import functools
 import os
 import subprocess
+import zlib
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from django.conf import settings
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+VERSION_FILE = BASE_DIR / "VERSION"
 
+# Version and build details are fixed for the life of the process, but the
+# context processor asks for them on every render; each getter runs once
 
+
+@functools.lru_cache(maxsize=None)
 def get_version():
     """Get application version from VERSION file"""
     try:
-        version_file = BASE_DIR / "VERSION"
-        if version_file.exists():
-            return version_file.read_text().strip()
-        return "Unknown"
+        return VERSION_FILE.read_text().strip()
     except Exception:
         return "Unknown"
 
 
+def _git_output(*args):
+    """Run a git command in the project directory and return its output"""
+    return (
+        subprocess.check_output(["git", *args], cwd=BASE_DIR, stderr=subprocess.DEVNULL)
+        .decode()
+        .strip()
+    )
+
+
+def _read_head_commit(git_dir):
+    """Resolve HEAD to (full commit hash, branch) from the .git directory"""
+    head = (git_dir / "HEAD").read_text().strip()
+    if not head.startswith("ref: "):
+        # Detached HEAD, reported like `git rev-parse --abbrev-ref HEAD`
+        return head, "HEAD"
+
+    ref = head[len("ref: "):]
+    branch = ref.removeprefix("refs/heads/")
+    ref_file = git_dir / ref
+    if ref_file.exists():
+        return ref_file.read_text().strip(), branch
+
+    # Refs packed by `git gc` live in packed-refs as "<hash> <ref>" lines
+    for line in (git_dir / "packed-refs").read_text().splitlines():
+        commit, _, name = line.partition(" ")
+        if name == ref:
+            return commit, branch
+
+    raise FileNotFoundError(ref)
+
+
+def _read_commit_date(git_dir, commit):
+    """Committer date (YYYY-MM-DD) of a loose commit object"""
+    obj = git_dir / "objects" / commit[:2] / commit[2:]
+    data = zlib.decompress(obj.read_bytes())
+    for line in data.split(b"\n"):
+        if line.startswith(b"committer "):
+            # committer <name> <email> <timestamp> <+hhmm>
+            timestamp, offset = line.rsplit(b" ", 2)[1:]
+            sign = -1 if offset.startswith(b"-") else 1
+            tz = timezone(sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5])))
+            return datetime.fromtimestamp(int(timestamp), tz).date().isoformat()
+        if not line:
+            break
+
+    raise ValueError(f"No committer in {commit}")
+
+
+@functools.lru_cache(maxsize=None)
 def get_git_info():
     """Get git commit information"""
+    # Read .git directly instead of forking git; worktrees, packed objects and
+    # other layouts fall back to the git CLI
+    git_dir = BASE_DIR / ".git"
     try:
-        # Get current commit hash
-        commit_hash = (
-            subprocess.check_output(
-                ["git", "rev-parse", "--short", "HEAD"],
-                cwd=BASE_DIR,
-                stderr=subprocess.DEVNULL,
-            )
-            .decode()
-            .strip()
-        )
-
-        # Get current branch
-        branch = (
-            subprocess.check_output(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                cwd=BASE_DIR,
-                stderr=subprocess.DEVNULL,
-            )
-            .decode()
-            .strip()
-        )
-
-        # Get commit date
-        commit_date = (
-            subprocess.check_output(
-                ["git", "log", "-1", "--format=%cd", "--date=short"],
-                cwd=BASE_DIR,
-                stderr=subprocess.DEVNULL,
-            )
-            .decode()
-            .strip()
-        )
+        commit, branch = _read_head_commit(git_dir)
+        try:
+            commit_date = _read_commit_date(git_dir, commit)
+        except (OSError, ValueError, zlib.error):
+            try:
+                commit_date = _git_output("log", "-1", "--format=%cd", "--date=short")
+            except (OSError, subprocess.CalledProcessError):
+                # e.g. packed objects with git missing or refusing the repo
+                commit_date = None
 
         return {
-            "commit_hash": commit_hash,
+            "commit_hash": commit[:7],
             "branch": branch,
             "commit_date": commit_date,
         }
+    except (OSError, ValueError):
+        pass
+
+    try:
+        return {
+            "commit_hash": _git_output("rev-parse", "--short", "HEAD"),
+            "branch": _git_output("rev-parse", "--abbrev-ref", "HEAD"),
+            "commit_date": _git_output("log", "-1", "--format=%cd", "--date=short"),
+        }
     except Exception:
         return None
 
 
+@functools.lru_cache(maxsize=None)
 def get_build_info():
     """Get build information"""
     import platform
@@ -90,6 +134,7 @@ def get_build_info():
     return build_info
 
 
+@functools.lru_cache(maxsize=None)
 def get_version_display():
     """Get formatted version string for display"""
     version = get_version()